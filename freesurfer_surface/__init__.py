@@ -53,21 +53,38 @@ Find Border of Labelled Region
 >>> print(surface.find_label_border_polygonal_chains(region))
 """
 
+# pylint: disable=too-many-lines
+
 from __future__ import annotations
 
+import asyncio
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import dataclasses
 import datetime
+import heapq
+import io
 import itertools
 import locale
+import math
+import os
 import re
 import struct
 import typing
 
 import numpy
 
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # pragma: no cover
+    # python<3.8
+    shared_memory = None  # type: ignore
+
+from freesurfer_surface.kd_tree import KDTree
+from freesurfer_surface.label_statistics import LabelStatistics, _VertexGroups
+
 try:
     from freesurfer_surface.version import __version__
 except ModuleNotFoundError:
@@ -288,17 +305,122 @@ class Label:
         return str(self)
 
 
+class _VertexLabelIndexMapping(typing.MutableMapping[int, int]):
+    """
+    dict-like view of an array of label indices by vertex index
+
+    Vertices with label index `Annotation.UNLABELLED_INDEX` are omitted.
+    The array is copied before its first modification
+    unless it was allocated by this class (copy-on-write).
+    """
+
+    def __init__(self):
+        self.array = numpy.full(0, Annotation.UNLABELLED_INDEX, dtype=numpy.int32)
+        self._owns_array = True
+
+    def replace(self, array: numpy.ndarray, copy_on_write: bool = True) -> None:
+        array = numpy.asanyarray(array)
+        if array.ndim != 1:
+            raise ValueError(f"expected 1-dimensional array, got {array.shape}")
+        self.array = array
+        self._owns_array = not copy_on_write
+
+    def _writable_array(self, length: int) -> numpy.ndarray:
+        if not self._owns_array or len(self.array) < length:
+            array = numpy.full(
+                max(length, len(self.array)),
+                Annotation.UNLABELLED_INDEX,
+                dtype=numpy.int32,
+            )
+            array[: len(self.array)] = self.array
+            self.array = array
+            self._owns_array = True
+        return self.array
+
+    def __getitem__(self, vertex_index: int) -> int:
+        if 0 <= vertex_index < len(self.array):
+            label_index = int(self.array[vertex_index])
+            if label_index != Annotation.UNLABELLED_INDEX:
+                return label_index
+        raise KeyError(vertex_index)
+
+    def __setitem__(self, vertex_index: int, label_index: int) -> None:
+        if vertex_index < 0:
+            raise KeyError(vertex_index)
+        self._writable_array(vertex_index + 1)[vertex_index] = label_index
+
+    def __delitem__(self, vertex_index: int) -> None:
+        self[vertex_index]  # pylint: disable=pointless-statement; raises KeyError
+        self._writable_array(0)[vertex_index] = Annotation.UNLABELLED_INDEX
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(
+            numpy.flatnonzero(self.array != Annotation.UNLABELLED_INDEX).tolist()
+        )
+
+    def __len__(self) -> int:
+        return int(numpy.count_nonzero(self.array != Annotation.UNLABELLED_INDEX))
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+@dataclasses.dataclass(frozen=True)
+class AnnotationHeader:
+    """
+    colortable of an annotation file (see `Annotation.read_header`)
+    """
+
+    annotated_vertices_num: int
+    colortable_path: typing.Optional[bytes]
+    labels: typing.Dict[int, Label]
+
+
 class Annotation:
 
     # pylint: disable=too-few-public-methods
 
     _TAG_OLD_COLORTABLE = b"\0\0\0\x01"
 
+    UNLABELLED_INDEX = -1
+
     def __init__(self):
-        self.vertex_label_index: typing.Dict[int, int] = {}
+        self._vertex_label_index = _VertexLabelIndexMapping()
         self.colortable_path: typing.Optional[bytes] = None
         self.labels: typing.Dict[int, Label] = {}
 
+    @property
+    def vertex_label_index(self) -> typing.MutableMapping[int, int]:
+        """
+        dict-like view of `vertex_label_indices`
+        mapping vertex indices to label indices (omitting unlabelled vertices)
+        """
+        return self._vertex_label_index
+
+    @vertex_label_index.setter
+    def vertex_label_index(self, label_index_by_vertex_index: typing.Dict[int, int]):
+        vertex_label_indices = numpy.full(
+            max(label_index_by_vertex_index.keys(), default=-1) + 1,
+            self.UNLABELLED_INDEX,
+            dtype=numpy.int32,
+        )
+        vertex_label_indices[list(label_index_by_vertex_index.keys())] = list(
+            label_index_by_vertex_index.values()
+        )
+        self._vertex_label_index.replace(vertex_label_indices, copy_on_write=False)
+
+    @property
+    def vertex_label_indices(self) -> numpy.ndarray:
+        """
+        array of label indices by vertex index,
+        `UNLABELLED_INDEX` for vertices without label
+        """
+        return self._vertex_label_index.array
+
+    @vertex_label_indices.setter
+    def vertex_label_indices(self, vertex_label_indices: numpy.ndarray) -> None:
+        self._vertex_label_index.replace(vertex_label_indices)
+
     @staticmethod
     def _read_label(stream: typing.BinaryIO) -> Label:
         index, name_length = struct.unpack(">II", stream.read(4 * 2))
@@ -317,9 +439,17 @@ class Annotation:
     def _read(self, stream: typing.BinaryIO) -> None:
         # https://surfer.nmr.mgh.harvard.edu/fswiki/LabelsClutsAnnotationFiles
         (annotations_num,) = struct.unpack(">I", stream.read(4))
-        annotations = [
-            struct.unpack(">II", stream.read(4 * 2)) for _ in range(annotations_num)
-        ]
+        # decode (vertex index, color code) pairs at once
+        annotations = numpy.frombuffer(
+            stream.read(4 * 2 * annotations_num), dtype=">u4"
+        ).reshape((annotations_num, 2))
+        self._read_colortable(stream)
+        self._vertex_label_index.replace(
+            self._vertex_label_indices(annotations), copy_on_write=False
+        )
+        assert not stream.read(1)
+
+    def _read_colortable(self, stream: typing.BinaryIO) -> None:
         assert stream.read(4) == self._TAG_OLD_COLORTABLE
         colortable_version, _, filename_length = struct.unpack(
             ">III", stream.read(4 * 3)
@@ -332,14 +462,31 @@ class Annotation:
             label.index: label
             for label in (self._read_label(stream) for _ in range(labels_num))
         }
+
+    def _vertex_label_indices(self, annotations: numpy.ndarray) -> numpy.ndarray:
         label_index_by_color_code = {
             label.color_code: label.index for label in self.labels.values()
         }
-        self.vertex_label_index = {
-            vertex_index: label_index_by_color_code[color_code]
-            for vertex_index, color_code in annotations
-        }
-        assert not stream.read(1)
+        color_codes = numpy.array(sorted(label_index_by_color_code), dtype=numpy.int64)
+        label_indices = numpy.array(
+            [label_index_by_color_code[c] for c in color_codes.tolist()],
+            dtype=numpy.int32,
+        )
+        vertex_label_indices = numpy.full(
+            annotations[:, 0].max() + 1 if len(annotations) else 0,
+            self.UNLABELLED_INDEX,
+            dtype=numpy.int32,
+        )
+        if len(color_codes):
+            positions = numpy.searchsorted(color_codes, annotations[:, 1]).clip(
+                max=len(color_codes) - 1
+            )
+            # vertices with color codes missing in colortable remain unlabelled
+            matched = color_codes[positions] == annotations[:, 1]
+            vertex_label_indices[annotations[matched, 0]] = label_indices[
+                positions[matched]
+            ]
+        return vertex_label_indices
 
     @classmethod
     def read(cls, annotation_file_path: str) -> "Annotation":
@@ -349,11 +496,517 @@ class Annotation:
             annotation._read(annotation_file)
         return annotation
 
+    @classmethod
+    def read_header(cls, annotation_file_path: str) -> AnnotationHeader:
+        """
+        Read number of annotated vertices & colortable,
+        skipping the vertices' label color codes.
+        """
+        annotation = cls()
+        with open(annotation_file_path, "rb") as annotation_file:
+            (annotations_num,) = struct.unpack(">I", annotation_file.read(4))
+            annotation_file.seek(4 * 2 * annotations_num, io.SEEK_CUR)
+            # pylint: disable=protected-access
+            annotation._read_colortable(annotation_file)
+            assert not annotation_file.read(1)
+        return AnnotationHeader(
+            annotated_vertices_num=annotations_num,
+            colortable_path=annotation.colortable_path,
+            labels=annotation.labels,
+        )
 
-class Surface:
+    @classmethod
+    async def read_async(
+        cls,
+        annotation_file_path: str,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+    ) -> "Annotation":
+        """
+        Read annotation file in `executor` (default: event loop's default executor)
+        without blocking the event loop.
+        The executor's number of workers bounds the number of concurrent reads.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, cls.read, annotation_file_path
+        )
+
+    @classmethod
+    def read_many(
+        cls,
+        annotation_file_paths: typing.Iterable[str],
+        workers: typing.Optional[int] = None,
+    ) -> typing.List["Annotation"]:
+        """
+        Read annotation files in a pool of `workers` processes
+        (default: number of processors).
+        """
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(cls.read, annotation_file_paths))
+
+    @staticmethod
+    def _write_label(stream: typing.BinaryIO, label: Label) -> None:
+        name = label.name.encode()
+        stream.write(
+            struct.pack(">II", label.index, len(name) + 1)
+            + name
+            + b"\0"
+            + struct.pack(
+                ">IIII", label.red, label.green, label.blue, label.transparency
+            )
+        )
+
+    def _write(self, stream: typing.BinaryIO) -> None:
+        labelled_mask = self.vertex_label_indices != self.UNLABELLED_INDEX
+        label_indices = self.vertex_label_indices[labelled_mask]
+        missing_label_indices = set(numpy.unique(label_indices).tolist()).difference(
+            self.labels.keys()
+        )
+        if missing_label_indices:
+            raise ValueError(
+                f"Missing labels with indices {sorted(missing_label_indices)}"
+                " (add to attribute `labels`)"
+            )
+        color_codes = numpy.zeros(
+            max(self.labels.keys(), default=-1) + 1, dtype=numpy.uint32
+        )
+        for label in self.labels.values():
+            color_codes[label.index] = label.color_code
+        # like MRISwriteAnnotation, write (vertex index, color code) pairs
+        # of all vertices with color code 0 for unlabelled vertices
+        annotations = numpy.zeros((len(self.vertex_label_indices), 2), dtype=">u4")
+        annotations[:, 0] = numpy.arange(len(self.vertex_label_indices))
+        annotations[labelled_mask, 1] = color_codes[label_indices]
+        colortable_path = self.colortable_path or b""
+        stream.write(
+            struct.pack(">I", len(annotations))
+            + annotations.tobytes()
+            + self._TAG_OLD_COLORTABLE
+            # negative version number indicates new colortable format
+            + struct.pack(">iII", -2, len(color_codes), len(colortable_path) + 1)
+            + colortable_path
+            + b"\0"
+            + struct.pack(">I", len(self.labels))
+        )
+        for label in self.labels.values():
+            self._write_label(stream, label)
+
+    def write(self, annotation_file_path: str) -> None:
+        with open(annotation_file_path, "wb") as annotation_file:
+            self._write(annotation_file)
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class VertexAdjacency:
+    """
+    compressed sparse row (CSR) representation of the graph
+    formed by vertices and the edges of triangles
+
+    neighbours of vertex `i` (ascending): `indices[indptr[i]:indptr[i + 1]]`
+    number of triangles sharing the respective edges:
+    `triangle_counts[indptr[i]:indptr[i + 1]]`
+    """
+
+    indptr: numpy.ndarray
+    indices: numpy.ndarray
+    triangle_counts: numpy.ndarray
+
+    @classmethod
+    def from_triangles(
+        cls, vertices_num: int, triangle_vertex_indices: numpy.ndarray
+    ) -> "VertexAdjacency":
+        triangle_vertex_indices = numpy.asarray(
+            triangle_vertex_indices, dtype=numpy.int64
+        ).reshape((-1, 3))
+        edge_starts = triangle_vertex_indices.ravel()
+        edge_ends = numpy.roll(triangle_vertex_indices, -1, axis=1).ravel()
+        edge_keys, triangle_counts = numpy.unique(
+            numpy.concatenate((edge_starts, edge_ends)) * vertices_num
+            + numpy.concatenate((edge_ends, edge_starts)),
+            return_counts=True,
+        )
+        indptr = numpy.zeros(vertices_num + 1, dtype=numpy.int64)
+        numpy.cumsum(
+            numpy.bincount(edge_keys // max(vertices_num, 1), minlength=vertices_num),
+            out=indptr[1:],
+        )
+        return cls(
+            indptr=indptr,
+            indices=edge_keys % max(vertices_num, 1),
+            triangle_counts=triangle_counts,
+        )
+
+    def neighbours(self, vertex_index: int) -> numpy.ndarray:
+        return self.indices[self.indptr[vertex_index] : self.indptr[vertex_index + 1]]
+
+    def neighbour_triangle_counts(self, vertex_index: int) -> numpy.ndarray:
+        return self.triangle_counts[
+            self.indptr[vertex_index] : self.indptr[vertex_index + 1]
+        ]
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class EdgeTable:
+    """
+    unique edges of triangles
+
+    `vertex_indices`: (E, 2) array of vertex indices per edge
+    (ascending within and across rows)
+    `triangle_edge_indices`: (M, 3) array of edge indices per triangle,
+    column k refers to the edge between the triangle's vertices k and k + 1 (mod 3)
+    `triangle_counts`: number of triangles sharing each edge
+    `edge_triangle_indices`: (E, 2) array of the (first) two triangles
+    sharing each edge, -1 for edges of a single triangle
+    """
+
+    vertex_indices: numpy.ndarray
+    triangle_edge_indices: numpy.ndarray
+    triangle_counts: numpy.ndarray
+    edge_triangle_indices: numpy.ndarray
+
+    @classmethod
+    def from_triangles(
+        cls, vertices_num: int, triangle_vertex_indices: numpy.ndarray
+    ) -> "EdgeTable":
+        triangle_vertex_indices = numpy.asarray(
+            triangle_vertex_indices, dtype=numpy.int64
+        ).reshape((-1, 3))
+        edge_vertex_indices = numpy.sort(
+            numpy.stack(
+                (
+                    triangle_vertex_indices,
+                    numpy.roll(triangle_vertex_indices, -1, axis=1),
+                ),
+                axis=2,
+            ).reshape((-1, 2)),
+            axis=1,
+        )
+        edge_keys, edge_indices, triangle_counts = numpy.unique(
+            edge_vertex_indices[:, 0] * vertices_num + edge_vertex_indices[:, 1],
+            return_inverse=True,
+            return_counts=True,
+        )
+        edge_indices = edge_indices.reshape((-1, 3))
+        # triangles sorted by edge, grouped by edge index
+        edge_triangle_indices = (
+            numpy.argsort(edge_indices, axis=None, kind="stable") // 3
+        )
+        first_positions = numpy.cumsum(triangle_counts) - triangle_counts
+        second_positions = numpy.minimum(
+            first_positions + 1, len(edge_triangle_indices) - 1
+        )
+        return cls(
+            vertex_indices=numpy.stack(
+                (
+                    edge_keys // max(vertices_num, 1),
+                    edge_keys % max(vertices_num, 1),
+                ),
+                axis=1,
+            ).reshape((-1, 2)),
+            triangle_edge_indices=edge_indices,
+            triangle_counts=triangle_counts,
+            edge_triangle_indices=numpy.stack(
+                (
+                    edge_triangle_indices[first_positions],
+                    numpy.where(
+                        triangle_counts > 1,
+                        edge_triangle_indices[second_positions],
+                        -1,
+                    ),
+                ),
+                axis=1,
+            ).reshape((-1, 2)),
+        )
+
+    @property
+    def boundary_mask(self) -> numpy.ndarray:
+        """
+        edges of a single triangle
+        """
+        return self.triangle_counts == 1
+
+    @property
+    def non_manifold_mask(self) -> numpy.ndarray:
+        """
+        edges shared by more than two triangles
+        """
+        return self.triangle_counts > 2
+
+
+def _squared_distance_blocks(
+    source_coordinates: numpy.ndarray,
+    target_coordinates: numpy.ndarray,
+    dtype: typing.Type[numpy.floating],
+    max_block_bytes: int,
+) -> typing.Iterator[typing.Tuple[int, numpy.ndarray]]:
+    if numpy.dtype(dtype).kind != "f":
+        raise ValueError(f"expected floating point dtype, got {dtype}")
+    source_coordinates = source_coordinates.astype(dtype)
+    # contiguous rows per axis for broadcasting against blocks of sources
+    target_axes = numpy.ascontiguousarray(target_coordinates.astype(dtype).T)
+    # subtract axis by axis instead of expanding the square of the difference
+    # to avoid cancellation for nearby points & (S, T, 3) temporaries
+    block_size = max(
+        1,
+        max_block_bytes
+        // (2 * numpy.dtype(dtype).itemsize * max(1, target_axes.shape[1])),
+    )
+    squared_distances = numpy.empty(
+        (min(block_size, len(source_coordinates)), target_axes.shape[1]),
+        dtype=dtype,
+    )
+    differences = numpy.empty_like(squared_distances)
+    for start in range(0, len(source_coordinates), block_size):
+        block = source_coordinates[start : start + block_size]
+        block_squared_distances = squared_distances[: len(block)]
+        block_differences = differences[: len(block)]
+        numpy.subtract(
+            block[:, 0, numpy.newaxis], target_axes[0], out=block_squared_distances
+        )
+        numpy.square(block_squared_distances, out=block_squared_distances)
+        for axis in (1, 2):
+            numpy.subtract(
+                block[:, axis, numpy.newaxis], target_axes[axis], out=block_differences
+            )
+            numpy.square(block_differences, out=block_differences)
+            block_squared_distances += block_differences
+        yield start, block_squared_distances
+
+
+def _normalized_rows(vectors: numpy.ndarray) -> numpy.ndarray:
+    lengths = numpy.sqrt(numpy.einsum("ij,ij->i", vectors, vectors))
+    return numpy.divide(
+        vectors,
+        lengths[:, numpy.newaxis],
+        out=numpy.zeros(vectors.shape),
+        where=lengths[:, numpy.newaxis] > 0,
+    )
+
+
+_RowItem = typing.TypeVar("_RowItem")
+_Derived = typing.TypeVar("_Derived")
+
+
+class _ArrayRows(typing.MutableSequence[_RowItem]):
+    """
+    list-like view of the rows of an (N, 3) array
+
+    The array is copied before its first modification
+    unless it was allocated by this class (copy-on-write),
+    so read-only & memory-mapped arrays may be wrapped without copying.
+
+    `version` is incremented on every modification.
+    """
+
+    # pylint: disable=eq-without-hash; mutable
+
+    _DTYPE: typing.Type[numpy.generic]
+
+    def __init__(self, items: typing.Iterable[_RowItem] = ()):
+        self._buffer = numpy.empty((0, 3), dtype=self._DTYPE)
+        self._length = 0
+        self._owns_buffer = True
+        self.version = 0
+        self.extend(items)
+
+    @staticmethod
+    def _item_to_row(item: _RowItem) -> typing.Iterable:
+        raise NotImplementedError()  # pragma: no cover
+
+    @staticmethod
+    def _row_to_item(row: numpy.ndarray) -> _RowItem:
+        raise NotImplementedError()  # pragma: no cover
+
+    @property
+    def array(self) -> numpy.ndarray:
+        return self._buffer[: self._length]
+
+    def replace(self, array: numpy.ndarray, copy_on_write: bool = True) -> None:
+        array = numpy.asanyarray(array)
+        if array.size == 0:
+            array = array.reshape((0, 3))
+        if array.ndim != 2 or array.shape[1] != 3:
+            raise ValueError(f"expected array of shape (N, 3), got {array.shape}")
+        self._buffer = array
+        self._length = len(array)
+        self._owns_buffer = not copy_on_write
+        self.version += 1
+
+    def _items_to_array(self, items: typing.Iterable[_RowItem]) -> numpy.ndarray:
+        if isinstance(items, _ArrayRows):
+            return items.array
+        return numpy.array(
+            [self._item_to_row(item) for item in items], dtype=self._DTYPE
+        ).reshape((-1, 3))
+
+    def _writable_buffer(self, length: int) -> numpy.ndarray:
+        self.version += 1
+        if not self._owns_buffer or len(self._buffer) < length:
+            # grow geometrically for amortized constant time appends
+            buffer = numpy.empty(
+                (max(length, self._length * 2, 8), 3), dtype=self._DTYPE
+            )
+            buffer[: self._length] = self.array
+            self._buffer = buffer
+            self._owns_buffer = True
+        return self._buffer
+
+    def __len__(self) -> int:
+        return self._length
+
+    @typing.overload
+    def __getitem__(self, index: int) -> _RowItem:
+        ...  # pragma: no cover
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> typing.List[_RowItem]:
+        ...  # pragma: no cover
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row_to_item(row) for row in self.array[index]]
+        return self._row_to_item(self.array[index])
+
+    def __iter__(self) -> typing.Iterator[_RowItem]:
+        return map(self._row_to_item, self.array)
+
+    @typing.overload
+    def __setitem__(self, index: int, value: _RowItem) -> None:
+        ...  # pragma: no cover
+
+    @typing.overload
+    def __setitem__(self, index: slice, value: typing.Iterable[_RowItem]) -> None:
+        ...  # pragma: no cover
+
+    def __setitem__(self, index, value):
+        if not isinstance(index, slice):
+            self._writable_buffer(self._length)[: self._length][
+                index
+            ] = self._item_to_row(value)
+            return
+        rows = self._items_to_array(value)
+        start, stop, step = index.indices(self._length)
+        if step == 1:
+            self.replace(
+                numpy.concatenate(
+                    (self.array[:start], rows, self.array[max(start, stop) :])
+                ).astype(self._DTYPE, copy=False),
+                copy_on_write=False,
+            )
+        else:
+            self._writable_buffer(self._length)[: self._length][index] = rows
+
+    def __delitem__(self, index: typing.Union[int, slice]) -> None:
+        if self._length and not isinstance(index, slice):
+            if index in (-1, self._length - 1):
+                self._length -= 1
+                self.version += 1
+                return
+        self.replace(
+            numpy.delete(self.array, index, axis=0).astype(self._DTYPE, copy=False),
+            copy_on_write=False,
+        )
+
+    def insert(self, index: int, value: _RowItem) -> None:
+        if index < 0:
+            index = max(index + self._length, 0)
+        if index < self._length:
+            self[index:index] = [value]
+        else:
+            self.extend([value])
+
+    def extend(self, values: typing.Iterable[_RowItem]) -> None:
+        rows = self._items_to_array(values)
+        self._writable_buffer(self._length + len(rows))[
+            self._length : self._length + len(rows)
+        ] = rows
+        self._length += len(rows)
+
+    def __array__(self, dtype: typing.Optional[numpy.dtype] = None) -> numpy.ndarray:
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (_ArrayRows, list)):
+            return NotImplemented
+        return numpy.array_equal(self.array, self._items_to_array(other))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _VertexList(_ArrayRows[Vertex]):
+
+    _DTYPE = numpy.float64
+
+    @staticmethod
+    def _item_to_row(item: Vertex) -> typing.Iterable:
+        return item
+
+    @staticmethod
+    def _row_to_item(row: numpy.ndarray) -> Vertex:
+        # copy, so vertices do not change with the (memory-mapped) array.
+        # read-only, so in-place writes fail instead of being silently dropped.
+        vertex = numpy.array(row, dtype=float).view(Vertex)
+        vertex.flags.writeable = False
+        return vertex
+
+
+class _TriangleList(_ArrayRows[Triangle]):
+
+    # pylint: disable=eq-without-hash; mutable
+
+    _DTYPE = numpy.uint32
+
+    @staticmethod
+    def _item_to_row(item: Triangle) -> typing.Iterable:
+        return item.vertex_indices
+
+    @staticmethod
+    def _row_to_item(row: numpy.ndarray) -> Triangle:
+        return Triangle(row.tolist())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (_ArrayRows, list)):
+            return NotImplemented
+        # Triangle.__eq__ ignores rotation & direction of vertex indices
+        return list(self) == list(other)
+
+
+@dataclasses.dataclass(frozen=True)
+class TriangularSurfaceHeader:
+    """
+    metadata of a surface file in TriangularSurface format
+    (see `Surface.read_triangular_header`)
+    """
 
     # pylint: disable=too-many-instance-attributes
 
+    creator: bytes
+    creation_datetime: typing.Optional[datetime.datetime]
+    vertices_num: int
+    triangles_num: int
+    using_old_real_ras: bool
+    volume_geometry_info: typing.Optional[typing.Tuple[bytes, ...]]
+    command_lines: typing.Tuple[bytes, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class _DistancePropagation:
+    """
+    state of `Surface.geodesic_distances_mm()`:
+    tentative distance of each vertex, flags of vertices with final distances
+    & heap of (distance, vertex index)
+    """
+
+    distances: typing.List[float]
+    accepted: bytearray
+    heap: typing.List[typing.Tuple[float, int]]
+    max_distance_mm: float
+
+
+class Surface:
+
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
+
     _MAGIC_NUMBER = b"\xff\xff\xfe"
 
     _TAG_CMDLINE = b"\x00\x00\x00\x03"
@@ -365,12 +1018,62 @@ class Surface:
     def __init__(self):
         self.creator: bytes = b"pypi.org/project/freesurfer-surface/"
         self.creation_datetime: typing.Optional[datetime.datetime] = None
-        self.vertices: typing.List[Vertex] = []
-        self.triangles: typing.List[Triangle] = []
+        self._vertices = _VertexList()
+        self._triangles = _TriangleList()
         self.using_old_real_ras: bool = False
         self.volume_geometry_info: typing.Optional[typing.Tuple[bytes, ...]] = None
         self.command_lines: typing.List[bytes] = []
         self.annotation: typing.Optional[Annotation] = None
+        # name -> (dependency, version of dependency, data)
+        self._derived_data: typing.Dict[
+            str, typing.Tuple[str, typing.Tuple[int, ...], typing.Any]
+        ] = {}
+
+    @property
+    def vertices(self) -> typing.MutableSequence[Vertex]:
+        """
+        list-like view of `vertex_coordinates`
+        """
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices: typing.MutableSequence[Vertex]) -> None:
+        # pylint: disable=protected-access
+        self._vertices.replace(self._vertices._items_to_array(vertices))
+
+    @property
+    def triangles(self) -> typing.MutableSequence[Triangle]:
+        """
+        list-like view of `triangle_vertex_indices`
+        """
+        return self._triangles
+
+    @triangles.setter
+    def triangles(self, triangles: typing.MutableSequence[Triangle]) -> None:
+        # pylint: disable=protected-access
+        self._triangles.replace(self._triangles._items_to_array(triangles))
+
+    @property
+    def vertex_coordinates(self) -> numpy.ndarray:
+        """
+        (N, 3) array of vertex coordinates (right, anterior, superior)
+        """
+        return self._vertices.array
+
+    @vertex_coordinates.setter
+    def vertex_coordinates(self, coordinates: numpy.ndarray) -> None:
+        self._vertices.replace(coordinates)
+
+    @property
+    def triangle_vertex_indices(self) -> numpy.ndarray:
+        """
+        (M, 3) array of the indices of each triangle's vertices
+        """
+        return self._triangles.array
+
+    @triangle_vertex_indices.setter
+    def triangle_vertex_indices(self, vertex_indices: numpy.ndarray) -> None:
+        self._triangles.replace(vertex_indices)
 
     @classmethod
     def _read_cmdlines(cls, stream: typing.BinaryIO) -> typing.Iterator[bytes]:
@@ -385,7 +1088,9 @@ class Surface:
             yield stream.read(str_length - 1)
             assert stream.read(1) == b"\x00"
 
-    def _read_triangular(self, stream: typing.BinaryIO):
+    def _read_triangular_preamble(
+        self, stream: typing.BinaryIO
+    ) -> typing.Tuple[int, int]:
         assert stream.read(3) == self._MAGIC_NUMBER
         creation_match = re.match(
             rb"^created by (\w+) on (.* \d{4})\n", stream.readline()
@@ -400,19 +1105,9 @@ class Surface:
         # fwriteInt
         # https://github.com/freesurfer/freesurfer/blob/release_6_0_0/utils/fio.c#L290
         vertices_num, triangles_num = struct.unpack(">II", stream.read(4 * 2))
-        self.vertices = [
-            Vertex(*struct.unpack(">fff", stream.read(4 * 3)))
-            for _ in range(vertices_num)
-        ]
-        self.triangles = [
-            Triangle(struct.unpack(">III", stream.read(4 * 3)))
-            for _ in range(triangles_num)
-        ]
-        assert all(
-            vertex_idx < vertices_num
-            for triangle in self.triangles
-            for vertex_idx in triangle.vertex_indices
-        )
+        return vertices_num, triangles_num
+
+    def _read_triangular_trailer(self, stream: typing.BinaryIO) -> None:
         assert stream.read(4) == self._TAG_OLD_USEREALRAS
         (using_old_real_ras,) = struct.unpack(">I", stream.read(4))
         assert using_old_real_ras in {0, 1}, using_old_real_ras
@@ -423,6 +1118,29 @@ class Surface:
         self.volume_geometry_info = tuple(stream.readline() for _ in range(8))
         self.command_lines = list(self._read_cmdlines(stream))
 
+    @staticmethod
+    def _read_triangular_blocks(
+        stream: typing.BinaryIO, vertices_num: int, triangles_num: int
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        # decode blocks at once instead of calling struct.unpack per vertex / triangle
+        vertex_coords = numpy.frombuffer(
+            stream.read(4 * 3 * vertices_num), dtype=">f4"
+        ).reshape((vertices_num, 3))
+        triangle_vertex_indices = numpy.frombuffer(
+            stream.read(4 * 3 * triangles_num), dtype=">u4"
+        ).reshape((triangles_num, 3))
+        assert not triangles_num or triangle_vertex_indices.max() < vertices_num
+        return vertex_coords.astype(float), triangle_vertex_indices.astype(numpy.uint32)
+
+    def _read_triangular(self, stream: typing.BinaryIO):
+        vertices_num, triangles_num = self._read_triangular_preamble(stream)
+        vertex_coords, triangle_vertex_indices = self._read_triangular_blocks(
+            stream, vertices_num, triangles_num
+        )
+        self._vertices.replace(vertex_coords, copy_on_write=False)
+        self._triangles.replace(triangle_vertex_indices, copy_on_write=False)
+        self._read_triangular_trailer(stream)
+
     @classmethod
     def read_triangular(cls, surface_file_path: str) -> "Surface":
         surface = cls()
@@ -431,6 +1149,211 @@ class Surface:
             surface._read_triangular(surface_file)
         return surface
 
+    @classmethod
+    def read_triangular_header(cls, surface_file_path: str) -> TriangularSurfaceHeader:
+        """
+        Read preamble & trailing tags of a surface file,
+        skipping the vertex & triangle blocks.
+        """
+        surface, vertices_num, triangles_num, _ = cls._scan_triangular(
+            surface_file_path
+        )
+        return TriangularSurfaceHeader(
+            creator=surface.creator,
+            creation_datetime=surface.creation_datetime,
+            vertices_num=vertices_num,
+            triangles_num=triangles_num,
+            using_old_real_ras=surface.using_old_real_ras,
+            volume_geometry_info=surface.volume_geometry_info,
+            command_lines=tuple(surface.command_lines),
+        )
+
+    @classmethod
+    async def read_triangular_async(
+        cls,
+        surface_file_path: str,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+    ) -> "Surface":
+        """
+        Read surface file in `executor` (default: event loop's default executor)
+        without blocking the event loop.
+        The executor's number of workers bounds the number of concurrent reads.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, cls.read_triangular, surface_file_path
+        )
+
+    @classmethod
+    def _read_triangular_to_shared_memory(
+        cls, surface_file_path: str
+    ) -> typing.Tuple["Surface", typing.Optional[str], int, int]:
+        """
+        reads surface file & moves vertex & triangle arrays to shared memory
+
+        returns surface without vertices & triangles (unless shared memory
+        is unavailable), name of shared memory and numbers of vertices & triangles
+        """
+        surface = cls.read_triangular(surface_file_path)
+        vertex_coordinates = surface.vertex_coordinates
+        triangle_vertex_indices = surface.triangle_vertex_indices
+        if shared_memory is None:  # pragma: no cover
+            # python<3.8, arrays get pickled
+            return surface, None, len(vertex_coordinates), len(triangle_vertex_indices)
+        memory = shared_memory.SharedMemory(
+            create=True,
+            size=max(vertex_coordinates.nbytes + triangle_vertex_indices.nbytes, 1),
+        )
+        try:
+            numpy.ndarray(
+                vertex_coordinates.shape, vertex_coordinates.dtype, buffer=memory.buf
+            )[:] = vertex_coordinates
+            numpy.ndarray(
+                triangle_vertex_indices.shape,
+                triangle_vertex_indices.dtype,
+                buffer=memory.buf,
+                offset=vertex_coordinates.nbytes,
+            )[:] = triangle_vertex_indices
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+        memory.close()
+        if os.name == "posix":
+            # prevent the worker's resource tracker from unlinking the shared memory
+            # on exit. ownership passes to the reading process (see _load_shared_memory)
+            # pylint: disable=protected-access
+            resource_tracker.unregister(memory._name, "shared_memory")  # type: ignore
+        surface.vertices = []
+        surface.triangles = []
+        return (
+            surface,
+            memory.name,
+            len(vertex_coordinates),
+            len(triangle_vertex_indices),
+        )
+
+    def _load_shared_memory(
+        self, memory_name: typing.Optional[str], vertices_num: int, triangles_num: int
+    ) -> None:
+        if memory_name is None:  # pragma: no cover
+            return  # python<3.8, arrays were pickled
+        memory = shared_memory.SharedMemory(name=memory_name)
+        try:
+            self._vertices.replace(
+                numpy.ndarray(
+                    (vertices_num, 3), dtype=numpy.float64, buffer=memory.buf
+                ).copy(),
+                copy_on_write=False,
+            )
+            self._triangles.replace(
+                numpy.ndarray(
+                    (triangles_num, 3),
+                    dtype=numpy.uint32,
+                    buffer=memory.buf,
+                    offset=vertices_num * 3 * 8,
+                ).copy(),
+                copy_on_write=False,
+            )
+        finally:
+            memory.close()
+            memory.unlink()
+
+    @staticmethod
+    def _unlink_shared_memory(memory_name: typing.Optional[str]) -> None:
+        if memory_name is None:  # pragma: no cover
+            return  # python<3.8
+        memory = shared_memory.SharedMemory(name=memory_name)
+        memory.close()
+        memory.unlink()
+
+    @classmethod
+    def read_triangular_many(
+        cls,
+        surface_file_paths: typing.Iterable[str],
+        workers: typing.Optional[int] = None,
+    ) -> typing.List["Surface"]:
+        """
+        Read surface files in a pool of `workers` processes
+        (default: number of processors).
+
+        Vertex & triangle arrays get transferred via shared memory
+        (python>=3.8) instead of being pickled.
+        """
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(cls._read_triangular_to_shared_memory, p)
+                for p in surface_file_paths
+            ]
+            pending_futures = set(futures)
+            try:
+                # copy & release shared memory as soon as each file was read,
+                # keeping at most one copy per worker in shared memory
+                for future in concurrent.futures.as_completed(futures):
+                    pending_futures.remove(future)
+                    if not future.exception():
+                        (
+                            surface,
+                            memory_name,
+                            vertices_num,
+                            triangles_num,
+                        ) = future.result()
+                        # pylint: disable=protected-access
+                        surface._load_shared_memory(
+                            memory_name, vertices_num, triangles_num
+                        )
+            finally:
+                # release shared memory of files read after copying failed
+                for future in pending_futures:
+                    future.cancel()
+                concurrent.futures.wait(pending_futures)
+                for future in pending_futures:
+                    if not future.cancelled() and not future.exception():
+                        cls._unlink_shared_memory(future.result()[1])
+        return [future.result()[0] for future in futures]
+
+    @staticmethod
+    def _memmap_block(
+        file_path: str, dtype: str, offset: int, rows_num: int
+    ) -> numpy.ndarray:
+        if not rows_num:  # mmap does not support empty mappings
+            return numpy.empty((0, 3), dtype=dtype)
+        return numpy.memmap(
+            file_path, dtype=dtype, mode="r", offset=offset, shape=(rows_num, 3)
+        )
+
+    @classmethod
+    def open_triangular(cls, surface_file_path: str, mmap: bool = True) -> "Surface":
+        """
+        Parse header & trailing tags of a surface file
+        and map its vertex & triangle blocks into memory (unless `mmap=False`)
+        instead of reading & decoding them.
+
+        `vertex_coordinates` & `triangle_vertex_indices` are read-only,
+        big-endian `numpy.memmap` arrays sharing the page cache
+        with other processes opening the same file.
+        They get copied before the first modification.
+        In contrast to `read_triangular`, triangles' vertex indices are not validated.
+        """
+        if not mmap:
+            return cls.read_triangular(surface_file_path)
+        surface = cls()
+        with open(surface_file_path, "rb") as surface_file:
+            # pylint: disable=protected-access
+            vertices_num, triangles_num = surface._read_triangular_preamble(
+                surface_file
+            )
+            vertices_offset = surface_file.tell()
+            triangles_offset = vertices_offset + 4 * 3 * vertices_num
+            surface_file.seek(triangles_offset + 4 * 3 * triangles_num)
+            surface._read_triangular_trailer(surface_file)
+        surface.vertex_coordinates = cls._memmap_block(
+            surface_file_path, ">f4", vertices_offset, vertices_num
+        )
+        surface.triangle_vertex_indices = cls._memmap_block(
+            surface_file_path, ">u4", triangles_offset, triangles_num
+        )
+        return surface
+
     @classmethod
     def _triangular_strftime(cls, creation_datetime: datetime.datetime) -> bytes:
         padded_day = f"{creation_datetime.day:>2}"
@@ -438,54 +1361,159 @@ class Surface:
         with setlocale("C"):
             return creation_datetime.strftime(fmt).encode()
 
+    def _write_triangular_preamble(
+        self,
+        stream: typing.BinaryIO,
+        vertices_num: int,
+        triangles_num: int,
+        creation_datetime: typing.Optional[datetime.datetime],
+    ) -> None:
+        if creation_datetime is None:
+            creation_datetime = datetime.datetime.now()
+        stream.write(
+            self._MAGIC_NUMBER
+            + b"created by "
+            + self.creator
+            + b" on "
+            + self._triangular_strftime(creation_datetime)
+            + b"\n\n"
+            + struct.pack(">II", vertices_num, triangles_num)
+        )
+
+    def _write_triangular_trailer(self, stream: typing.BinaryIO) -> None:
+        stream.write(
+            self._TAG_OLD_USEREALRAS
+            + struct.pack(">I", 1 if self.using_old_real_ras else 0)
+        )
+        if not self.volume_geometry_info:
+            raise ValueError(
+                "Missing geometry information (set attribute `volume_geometry_info`)"
+            )
+        stream.write(self._TAG_OLD_SURF_GEOM + b"".join(self.volume_geometry_info))
+        for command_line in self.command_lines:
+            stream.write(
+                self._TAG_CMDLINE
+                + struct.pack(">Q", len(command_line) + 1)
+                + command_line
+                + b"\0"
+            )
+
     def write_triangular(
         self,
         surface_file_path: str,
         creation_datetime: typing.Optional[datetime.datetime] = None,
     ):
-        if creation_datetime is None:
-            creation_datetime = datetime.datetime.now()
         with open(surface_file_path, "wb") as surface_file:
-            surface_file.write(
-                self._MAGIC_NUMBER
-                + b"created by "
-                + self.creator
-                + b" on "
-                + self._triangular_strftime(creation_datetime)
-                + b"\n\n"
-                + struct.pack(">II", len(self.vertices), len(self.triangles))
-            )
-            for vertex in self.vertices:
-                surface_file.write(struct.pack(">fff", *vertex))
-            for triangle in self.triangles:
-                assert all(
-                    vertex_index < len(self.vertices)
-                    for vertex_index in triangle.vertex_indices
-                )
-                surface_file.write(struct.pack(">III", *triangle.vertex_indices))
-            surface_file.write(
-                self._TAG_OLD_USEREALRAS
-                + struct.pack(">I", 1 if self.using_old_real_ras else 0)
+            self._write_triangular_preamble(
+                surface_file,
+                vertices_num=len(self.vertices),
+                triangles_num=len(self.triangles),
+                creation_datetime=creation_datetime,
             )
-            if not self.volume_geometry_info:
-                raise ValueError(
-                    "Missing geometry information (set attribute `volume_geometry_info`)"
-                )
-            surface_file.write(
-                self._TAG_OLD_SURF_GEOM + b"".join(self.volume_geometry_info)
-            )
-            for command_line in self.command_lines:
-                surface_file.write(
-                    self._TAG_CMDLINE
-                    + struct.pack(">Q", len(command_line) + 1)
-                    + command_line
-                    + b"\0"
-                )
+            assert not self.triangles or self.triangle_vertex_indices.max() < len(
+                self.vertices
+            )
+            # encode blocks at once instead of calling struct.pack per vertex / triangle
+            surface_file.write(self.vertex_coordinates.astype(">f4").tobytes())
+            surface_file.write(self.triangle_vertex_indices.astype(">u4").tobytes())
+            self._write_triangular_trailer(surface_file)
+
+    @classmethod
+    def _scan_triangular(
+        cls, surface_file_path: str
+    ) -> typing.Tuple["Surface", int, int, int]:
+        """
+        parses preamble & trailing tags, skipping vertex & triangle blocks
+
+        returns surface without vertices & triangles,
+        numbers of vertices & triangles and offset of vertex block
+        """
+        surface = cls()
+        with open(surface_file_path, "rb") as surface_file:
+            vertices_num, triangles_num = surface._read_triangular_preamble(
+                surface_file
+            )
+            vertices_offset = surface_file.tell()
+            surface_file.seek(4 * 3 * (vertices_num + triangles_num), io.SEEK_CUR)
+            surface._read_triangular_trailer(surface_file)
+        return surface, vertices_num, triangles_num, vertices_offset
+
+    @staticmethod
+    def _read_block_chunks(
+        surface_file_path: str, offset: int, rows_num: int, chunk_size: int
+    ) -> typing.Iterator[bytes]:
+        with open(surface_file_path, "rb") as surface_file:
+            surface_file.seek(offset)
+            for chunk_start in range(0, rows_num, chunk_size):
+                chunk_length = 4 * 3 * min(chunk_size, rows_num - chunk_start)
+                chunk = surface_file.read(chunk_length)
+                # file truncated after scan? (would yield empty / partial rows)
+                assert len(chunk) == chunk_length, (surface_file_path, chunk_start)
+                yield chunk
+
+    @classmethod
+    def unite_triangular_files(
+        cls,
+        surface_file_paths: typing.Iterable[str],
+        output_file_path: str,
+        creation_datetime: typing.Optional[datetime.datetime] = None,
+        chunk_size: int = 2**16,
+    ) -> None:
+        """
+        Unite surface files into a single file without loading them into memory.
+        Equivalent to `Surface.unite(map(Surface.read_triangular, surface_file_paths))`
+        followed by `write_triangular(output_file_path)`.
+
+        Copies vertex & (offset-shifted) triangle blocks in chunks
+        of up to `chunk_size` vertices / triangles.
+        """
+        surface_file_paths = list(surface_file_paths)
+        if not surface_file_paths:
+            raise ValueError("expected at least one surface file path")
+        scans = [cls._scan_triangular(p) for p in surface_file_paths]
+        union = scans[0][0]
+        with open(output_file_path, "wb") as output_file:
+            # pylint: disable=protected-access
+            union._write_triangular_preamble(
+                output_file,
+                vertices_num=sum(s[1] for s in scans),
+                triangles_num=sum(s[2] for s in scans),
+                creation_datetime=creation_datetime,
+            )
+            for surface_file_path, (_, vertices_num, _, offset) in zip(
+                surface_file_paths, scans
+            ):
+                # big-endian float32 like output, no need to decode
+                for chunk in cls._read_block_chunks(
+                    surface_file_path, offset, vertices_num, chunk_size
+                ):
+                    output_file.write(chunk)
+            vertex_index_offset = 0
+            for surface_file_path, (_, vertices_num, triangles_num, offset) in zip(
+                surface_file_paths, scans
+            ):
+                for chunk in cls._read_block_chunks(
+                    surface_file_path,
+                    offset + 4 * 3 * vertices_num,
+                    triangles_num,
+                    chunk_size,
+                ):
+                    triangle_vertex_indices = numpy.frombuffer(chunk, dtype=">u4")
+                    assert (
+                        not triangle_vertex_indices.size
+                        or triangle_vertex_indices.max() < vertices_num
+                    )
+                    output_file.write(
+                        (triangle_vertex_indices + vertex_index_offset)
+                        .astype(">u4")
+                        .tobytes()
+                    )
+                vertex_index_offset += vertices_num
+            union._write_triangular_trailer(output_file)
 
     def load_annotation_file(self, annotation_file_path: str) -> None:
         annotation = Annotation.read(annotation_file_path)
-        assert len(annotation.vertex_label_index) <= len(self.vertices)
-        assert max(annotation.vertex_label_index.keys()) < len(self.vertices)
+        assert len(annotation.vertex_label_indices) <= len(self.vertices)
         self.annotation = annotation
 
     def add_vertex(self, vertex: Vertex) -> int:
@@ -506,59 +1534,388 @@ class Surface:
         self.triangles.append(Triangle(vertex_indices[:3]))
         self.triangles.append(Triangle(vertex_indices[2:] + vertex_indices[:1]))
 
+    @property
+    def geometry_version(self) -> int:
+        """
+        incremented whenever `vertices` get modified
+        """
+        return self._vertices.version
+
+    @property
+    def topology_version(self) -> int:
+        """
+        incremented whenever `triangles` get modified
+        """
+        return self._triangles.version
+
+    def invalidate_derived_data(
+        self, geometry: bool = True, topology: bool = True
+    ) -> None:
+        """
+        Increment `geometry_version` and / or `topology_version`
+        after modifying `vertex_coordinates` / `triangle_vertex_indices` in place,
+        dropping derived data cached by methods like `edge_table()`.
+        Not required after assigning to or calling methods of `vertices` / `triangles`
+        (e.g. `surface.vertices[0] = Vertex(…)` or `surface.triangles.append(…)`),
+        assigning new arrays or calling methods like `add_vertex()`.
+        """
+        if geometry:
+            self._vertices.version += 1
+        if topology:
+            self._triangles.version += 1
+        # free memory of outdated data instead of waiting for recomputation
+        self._derived_data = {
+            name: (dependency, version, data)
+            for name, (dependency, version, data) in self._derived_data.items()
+            if version == self._dependency_version(dependency)
+        }
+
+    def _dependency_version(self, dependency: str) -> typing.Tuple[int, ...]:
+        """
+        version of data derived from
+        "topology" (triangles), "geometry" (vertices & triangles) or "vertices"
+        """
+        if dependency == "topology":
+            # number of vertices determines shape of adjacency matrix
+            return (self._triangles.version, len(self._vertices))
+        if dependency == "geometry":
+            return (self._vertices.version, self._triangles.version)
+        assert dependency == "vertices", dependency
+        return (self._vertices.version,)
+
+    def _derive(
+        self,
+        name: str,
+        dependency: str,
+        compute: typing.Callable[[], _Derived],
+    ) -> _Derived:
+        version = self._dependency_version(dependency)
+        if name in self._derived_data:
+            _, cached_version, data = self._derived_data[name]
+            if cached_version == version:
+                return data
+        data = compute()
+        self._derived_data[name] = (dependency, version, data)
+        return data
+
+    def adjacency_matrix(self) -> VertexAdjacency:
+        """
+        sparse adjacency matrix of vertices connected by triangle edges,
+        cached until `vertices` or `triangles` get modified
+        """
+        return self._derive(
+            "adjacency_matrix",
+            "topology",
+            lambda: VertexAdjacency.from_triangles(
+                len(self.vertices), self.triangle_vertex_indices
+            ),
+        )
+
+    def vertex_neighbours(self, vertex_index: int) -> numpy.ndarray:
+        return self.adjacency_matrix().neighbours(vertex_index)
+
+    def edge_table(self) -> EdgeTable:
+        """
+        unique edges of triangles and their incident triangles,
+        cached until `vertices` or `triangles` get modified
+        """
+        return self._derive(
+            "edge_table",
+            "topology",
+            lambda: EdgeTable.from_triangles(
+                len(self.vertices), self.triangle_vertex_indices
+            ),
+        )
+
+    def adjacency_edge_lengths_mm(self) -> numpy.ndarray:
+        """
+        lengths of the edges in `adjacency_matrix()` (aligned with its `indices`),
+        cached until `vertices` or `triangles` get modified
+        """
+
+        def compute() -> numpy.ndarray:
+            adjacency = self.adjacency_matrix()
+            coordinates = numpy.asarray(self.vertex_coordinates, dtype=numpy.float64)
+            differences = numpy.take(coordinates, adjacency.indices, axis=0)
+            differences -= numpy.repeat(
+                coordinates, numpy.diff(adjacency.indptr), axis=0
+            )
+            lengths = numpy.sqrt(numpy.einsum("ij,ij->i", differences, differences))
+            lengths.flags.writeable = False
+            return lengths
+
+        return self._derive("adjacency_edge_lengths", "geometry", compute)
+
+    def _vertex_triangle_corners(self) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        corners `3 * triangle_index + k` of the triangles of each vertex
+        in compressed sparse row format (`indptr`, `corners`),
+        cached until `vertices` or `triangles` get modified
+        """
+
+        def compute() -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+            corner_vertex_indices = self.triangle_vertex_indices.ravel()
+            indptr = numpy.zeros(len(self.vertices) + 1, dtype=numpy.int64)
+            numpy.cumsum(
+                numpy.bincount(corner_vertex_indices, minlength=len(self.vertices)),
+                out=indptr[1:],
+            )
+            return indptr, numpy.argsort(corner_vertex_indices, kind="stable")
+
+        return self._derive("vertex_triangle_corners", "topology", compute)
+
+    def _fast_marching_coefficients(self) -> numpy.ndarray:
+        """
+        (3T, 3) array of the inverse gram matrix `(q11, q12, q22)`
+        of the edges from each triangle corner to the next & the previous corner
+        (NaN for degenerate triangles),
+        cached until `vertices` or `triangles` get modified
+        """
+
+        def compute() -> numpy.ndarray:
+            corners = numpy.asarray(self.vertex_coordinates, dtype=numpy.float64)[
+                self.triangle_vertex_indices
+            ]
+            next_edges = numpy.roll(corners, -1, axis=1) - corners
+            previous_edges = numpy.roll(corners, -2, axis=1) - corners
+            gram = numpy.stack(
+                (
+                    numpy.einsum("ijk,ijk->ij", previous_edges, previous_edges),
+                    -numpy.einsum("ijk,ijk->ij", next_edges, previous_edges),
+                    numpy.einsum("ijk,ijk->ij", next_edges, next_edges),
+                ),
+                axis=2,
+            ).reshape((-1, 3))
+            determinants = gram[:, 0] * gram[:, 2] - gram[:, 1] ** 2
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                coefficients = (
+                    gram
+                    / numpy.where(determinants > 0, determinants, numpy.nan)[
+                        :, numpy.newaxis
+                    ]
+                )
+            coefficients.flags.writeable = False
+            return coefficients
+
+        return self._derive("fast_marching_coefficients", "geometry", compute)
+
+    def _fast_marching_update(
+        self, propagation: _DistancePropagation
+    ) -> typing.Callable[[int], None]:
+        """
+        function updating the distances of the corners of an accepted vertex's
+        triangles, whose other two corners are accepted,
+        assuming a planar wavefront within the triangle
+        (Kimmel & Sethian, 1998; obtuse triangles are not unfolded,
+        updates with the wavefront's origin outside of the triangle are skipped)
+        """
+        indptr, vertex_corners = (a.tolist() for a in self._vertex_triangle_corners())
+        corner_vertex_indices = self.triangle_vertex_indices.ravel().tolist()
+        next_corners, previous_corners = (
+            numpy.arange(len(corner_vertex_indices))
+            .reshape((-1, 3))[:, columns]
+            .ravel()
+            .tolist()
+            for columns in ([1, 2, 0], [2, 0, 1])
+        )
+        q11s, q12s, q22s = self._fast_marching_coefficients().T.tolist()
+        distances, accepted, heap = (
+            propagation.distances,
+            propagation.accepted,
+            propagation.heap,
+        )
+
+        def update_corner(
+            corner: int, next_distance: float, previous_distance: float
+        ) -> None:
+            q11, q12, q22 = q11s[corner], q12s[corner], q22s[corner]
+            # |gradient| = 1 for distance d:
+            # quadratic * d^2 - 2 * linear * d + constant = 0
+            quadratic = q11 + 2 * q12 + q22
+            linear = (q11 + q12) * next_distance + (q12 + q22) * previous_distance
+            constant = (
+                q11 * next_distance**2
+                + 2 * q12 * next_distance * previous_distance
+                + q22 * previous_distance**2
+                - 1
+            )
+            discriminant = linear * linear - quadratic * constant
+            # coefficients of degenerate triangles are NaN
+            if not quadratic > 0 or discriminant < 0:
+                return
+            distance = (linear + math.sqrt(discriminant)) / quadratic
+            vertex_index = corner_vertex_indices[corner]
+            if (
+                # wavefront reaches corner from within the triangle
+                q11 * (next_distance - distance) + q12 * (previous_distance - distance)
+                <= 0
+                and q12 * (next_distance - distance)
+                + q22 * (previous_distance - distance)
+                <= 0
+                and max(next_distance, previous_distance)
+                <= distance
+                < distances[vertex_index]
+                and distance <= propagation.max_distance_mm
+            ):
+                distances[vertex_index] = distance
+                heapq.heappush(heap, (distance, vertex_index))
+
+        def update(vertex_index: int) -> None:
+            for vertex_corner in vertex_corners[
+                indptr[vertex_index] : indptr[vertex_index + 1]
+            ]:
+                next_corner = next_corners[vertex_corner]
+                previous_corner = previous_corners[vertex_corner]
+                next_vertex_index = corner_vertex_indices[next_corner]
+                previous_vertex_index = corner_vertex_indices[previous_corner]
+                if accepted[previous_vertex_index] and not accepted[next_vertex_index]:
+                    update_corner(
+                        next_corner,
+                        distances[previous_vertex_index],
+                        distances[vertex_index],
+                    )
+                elif (
+                    accepted[next_vertex_index] and not accepted[previous_vertex_index]
+                ):
+                    update_corner(
+                        previous_corner,
+                        distances[vertex_index],
+                        distances[next_vertex_index],
+                    )
+
+        return update
+
+    def geodesic_distances_mm(
+        self,
+        source_vertex_indices: typing.Iterable[int],
+        max_distance_mm: float = math.inf,
+        fast_marching: bool = False,
+    ) -> numpy.ndarray:
+        """
+        distance of each vertex to the nearest source vertex
+        along the surface (infinite for vertices not reached within `max_distance_mm`)
+
+        Dijkstra's algorithm over `adjacency_edge_lengths_mm()`
+        overestimates distances by following edges only.
+        `fast_marching` propagates wavefronts across triangles instead
+        (more accurate, slower).
+        """
+        source_vertex_indices = numpy.unique(
+            numpy.asarray(list(source_vertex_indices), dtype=numpy.int64)
+        )
+        invalid_mask = (source_vertex_indices < 0) | (
+            source_vertex_indices >= len(self.vertices)
+        )
+        if invalid_mask.any():
+            raise ValueError(
+                f"expected source vertex indices in [0, {len(self.vertices)}),"
+                f" got {source_vertex_indices[invalid_mask].tolist()}"
+            )
+        propagation = _DistancePropagation(
+            distances=[math.inf] * len(self.vertices),
+            accepted=bytearray(len(self.vertices)),
+            heap=[
+                (0.0, vertex_index) for vertex_index in source_vertex_indices.tolist()
+            ],
+            max_distance_mm=max_distance_mm,
+        )
+        for vertex_index in source_vertex_indices.tolist():
+            propagation.distances[vertex_index] = 0.0
+        self._propagate_distances(
+            propagation,
+            update_triangles=(
+                self._fast_marching_update(propagation) if fast_marching else None
+            ),
+        )
+        return numpy.array(propagation.distances)
+
+    def _propagate_distances(
+        self,
+        propagation: _DistancePropagation,
+        update_triangles: typing.Optional[typing.Callable[[int], None]],
+    ) -> None:
+        """
+        Dijkstra's algorithm accepting the vertex nearest to the sources
+        & updating its neighbours' distances via edges (and triangles) each step
+        """
+        distances, accepted, heap = (
+            propagation.distances,
+            propagation.accepted,
+            propagation.heap,
+        )
+        adjacency = self.adjacency_matrix()
+        indptr, neighbours = adjacency.indptr.tolist(), adjacency.indices.tolist()
+        lengths = self.adjacency_edge_lengths_mm().tolist()
+        while heap:
+            distance, vertex_index = heapq.heappop(heap)
+            if accepted[vertex_index]:  # outdated entry
+                continue
+            accepted[vertex_index] = 1
+            for edge_index in range(indptr[vertex_index], indptr[vertex_index + 1]):
+                neighbour_distance = distance + lengths[edge_index]
+                neighbour = neighbours[edge_index]
+                if (
+                    neighbour_distance < distances[neighbour]
+                    and neighbour_distance <= propagation.max_distance_mm
+                ):
+                    distances[neighbour] = neighbour_distance
+                    heapq.heappush(heap, (neighbour_distance, neighbour))
+            if update_triangles:
+                update_triangles(vertex_index)
+
     def _triangle_count_by_adjacent_vertex_indices(
         self,
-    ) -> typing.Dict[int, typing.DefaultDict[int, int]]:
-        counts: typing.Dict[int, typing.DefaultDict[int, int]] = {
-            vertex_index: collections.defaultdict(lambda: 0)
+    ) -> typing.Dict[int, typing.Dict[int, int]]:
+        adjacency = self.adjacency_matrix()
+        return {
+            vertex_index: dict(
+                zip(
+                    adjacency.neighbours(vertex_index).tolist(),
+                    adjacency.neighbour_triangle_counts(vertex_index).tolist(),
+                )
+            )
             for vertex_index in range(len(self.vertices))
         }
-        for triangle in self.triangles:
-            for vertex_index_pair in triangle.adjacent_vertex_indices(2):
-                counts[vertex_index_pair[0]][vertex_index_pair[1]] += 1
-                counts[vertex_index_pair[1]][vertex_index_pair[0]] += 1
-        return counts
 
     def find_borders(self) -> typing.Iterator[PolygonalCircuit]:
-        border_neighbours = {}
-        for (
-            vertex_index,
-            neighbour_counts,
-        ) in self._triangle_count_by_adjacent_vertex_indices().items():
-            if not neighbour_counts:
-                yield PolygonalCircuit((vertex_index,))
-            else:
-                neighbours = [
-                    neighbour_index
-                    for neighbour_index, counts in neighbour_counts.items()
-                    if counts != 2
-                ]
-                if neighbours:
-                    assert len(neighbours) % 2 == 0, (vertex_index, neighbour_counts)
-                    border_neighbours[vertex_index] = neighbours
-        while border_neighbours:
-            vertex_index, neighbour_indices = border_neighbours.popitem()
-            cycle_indices = [vertex_index]
-            border_neighbours[vertex_index] = neighbour_indices[1:]
-            vertex_index = neighbour_indices[0]
-            while vertex_index != cycle_indices[0]:
-                neighbour_indices = border_neighbours.pop(vertex_index)
-                neighbour_indices.remove(cycle_indices[-1])
-                cycle_indices.append(vertex_index)
-                if len(neighbour_indices) > 1:
-                    border_neighbours[vertex_index] = neighbour_indices[1:]
-                vertex_index = neighbour_indices[0]
-            assert vertex_index in border_neighbours, (
-                vertex_index,
-                cycle_indices,
-                border_neighbours,
-            )
-            final_neighbour_indices = border_neighbours.pop(vertex_index)
-            assert final_neighbour_indices == [cycle_indices[-1]], (
-                vertex_index,
-                final_neighbour_indices,
-                cycle_indices,
+        edge_table = self.edge_table()
+        border_vertex_indices = edge_table.vertex_indices[
+            edge_table.triangle_counts != 2
+        ]
+        for vertex_index in numpy.flatnonzero(
+            numpy.bincount(
+                edge_table.vertex_indices.ravel(), minlength=len(self.vertices)
             )
+            == 0
+        ).tolist():
+            yield PolygonalCircuit((vertex_index,))
+        # border edge e has ends 2e (at its first vertex) & 2e + 1 (at its second).
+        # pairing the ends meeting at each vertex links the border edges to circuits.
+        end_vertex_indices = border_vertex_indices.ravel()
+        ends_by_vertex = numpy.argsort(end_vertex_indices, kind="stable")
+        assert not numpy.any(
+            numpy.bincount(end_vertex_indices) % 2
+        ), "odd number of border edges at vertex"
+        partner_ends = numpy.empty_like(ends_by_vertex)
+        partner_ends[ends_by_vertex[0::2]] = ends_by_vertex[1::2]
+        partner_ends[ends_by_vertex[1::2]] = ends_by_vertex[0::2]
+        # successor of end x: leave along x's edge, continue at partner of other end
+        successor_ends = partner_ends[
+            numpy.arange(len(end_vertex_indices)) ^ 1
+        ].tolist()
+        end_vertex_indices_list = end_vertex_indices.tolist()
+        visited_edges = bytearray(len(border_vertex_indices))
+        for start_end in range(0, len(end_vertex_indices), 2):
+            if visited_edges[start_end >> 1]:
+                continue
+            cycle_indices = []
+            end = start_end
+            while True:
+                visited_edges[end >> 1] = 1
+                cycle_indices.append(end_vertex_indices_list[end])
+                end = successor_ends[end]
+                if end == start_end:
+                    break
             yield PolygonalCircuit(cycle_indices)
 
     def _get_vertex_label_index(self, vertex_index: int) -> typing.Optional[int]:
@@ -568,132 +1925,614 @@ class Surface:
             )
         return self.annotation.vertex_label_index.get(vertex_index, None)
 
-    def _find_label_border_segments(self, label: Label) -> typing.Iterator[LineSegment]:
-        for triangle in self.triangles:
-            border_vertex_indices = tuple(
-                filter(
-                    lambda i: self._get_vertex_label_index(i) == label.index,
-                    triangle.vertex_indices,
-                )
+    def _vertex_label_indices(self) -> numpy.ndarray:
+        if not self.annotation:
+            raise RuntimeError(
+                "Missing annotation (call method `load_annotation_file` first)."
             )
-            if len(border_vertex_indices) == 2:
-                yield LineSegment(border_vertex_indices)
+        vertex_label_indices = numpy.full(
+            len(self.vertices), Annotation.UNLABELLED_INDEX, dtype=numpy.int32
+        )
+        annotated_vertices_num = min(
+            len(self.vertices), len(self.annotation.vertex_label_indices)
+        )
+        vertex_label_indices[
+            :annotated_vertices_num
+        ] = self.annotation.vertex_label_indices[:annotated_vertices_num]
+        return vertex_label_indices
+
+    def _label_border_edges(self) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        label indices & edge indices of label border segments, sorted by label
+
+        An edge borders a label, if both its vertices are in the label
+        and the third vertex of one of its triangles is not.
+        """
+        triangle_label_indices = self._vertex_label_indices()[
+            self.triangle_vertex_indices
+        ]
+        # column k: edge between triangle's vertices k & k + 1, opposite vertex k + 2
+        border_mask = (
+            (triangle_label_indices == numpy.roll(triangle_label_indices, -1, axis=1))
+            & (triangle_label_indices != numpy.roll(triangle_label_indices, -2, axis=1))
+            & (triangle_label_indices != Annotation.UNLABELLED_INDEX)
+        )
+        edge_table = self.edge_table()
+        edges_num = max(len(edge_table.vertex_indices), 1)
+        keys = numpy.unique(
+            triangle_label_indices[border_mask].astype(numpy.int64) * edges_num
+            + edge_table.triangle_edge_indices[border_mask]
+        )
+        return keys // edges_num, keys % edges_num
+
+    def _find_label_border_segments(self, label: Label) -> typing.Iterator[LineSegment]:
+        label_indices, edge_indices = self._label_border_edges()
+        return map(
+            LineSegment,
+            self.edge_table()
+            .vertex_indices[edge_indices[label_indices == label.index]]
+            .tolist(),
+        )
 
-    _VertexSubindex = typing.Tuple[int, int]
+    @staticmethod
+    def _branch_tour(
+        child_indices: typing.Dict[int, typing.List[int]], vertex_index: int
+    ) -> typing.Iterator[int]:
+        """
+        walks dangling branches attached to vertex out & back (depth first),
+        ending at `vertex_index`, if any
+        """
+        stack = [(vertex_index, iter(child_indices.pop(vertex_index, ())))]
+        while stack:
+            child_index = next(stack[-1][1], None)
+            if child_index is None:
+                stack.pop()
+                if stack:
+                    yield stack[-1][0]
+            else:
+                yield child_index
+                stack.append((child_index, iter(child_indices.pop(child_index, ()))))
 
-    @classmethod
-    def _duplicate_border(
-        cls,
-        neighbour_indices: typing.DefaultDict[
-            _VertexSubindex, typing.Set[_VertexSubindex]
-        ],
-        previous_index: _VertexSubindex,
-        current_index: _VertexSubindex,
-        junction_counter: int,
-    ) -> None:
-        split_index = (current_index[0], junction_counter)
-        neighbour_indices[previous_index].add(split_index)
-        neighbour_indices[split_index].add(previous_index)
-        next_index, *extra_indices = filter(
-            lambda i: i != previous_index, neighbour_indices[current_index]
-        )
-        if extra_indices:
-            neighbour_indices[next_index].add(split_index)
-            neighbour_indices[split_index].add(next_index)
-            neighbour_indices[next_index].remove(current_index)
-            neighbour_indices[current_index].remove(next_index)
-            return
-        cls._duplicate_border(
-            neighbour_indices=neighbour_indices,
-            previous_index=split_index,
-            current_index=next_index,
-            junction_counter=junction_counter,
+    @staticmethod
+    def _peel_branches(
+        neighbour_indices: typing.Dict[int, typing.Set[int]],
+    ) -> typing.Tuple[typing.Dict[int, typing.List[int]], typing.List[int]]:
+        """
+        removes dangling branches from `neighbour_indices`, leaves first
+
+        returns the removed vertices by the vertex they are attached to
+        and the roots of entirely removed trees
+        """
+        child_indices: typing.Dict[int, typing.List[int]] = collections.defaultdict(
+            list
         )
+        tree_root_indices = []
+        leaf_indices = collections.deque(
+            i for i, n in neighbour_indices.items() if len(n) == 1
+        )
+        while leaf_indices:
+            leaf_index = leaf_indices.popleft()
+            if not neighbour_indices[leaf_index]:
+                # all other vertices of tree removed
+                del neighbour_indices[leaf_index]
+                tree_root_indices.append(leaf_index)
+                continue
+            (parent_index,) = neighbour_indices.pop(leaf_index)
+            child_indices[parent_index].append(leaf_index)
+            parent_neighbour_indices = neighbour_indices[parent_index]
+            parent_neighbour_indices.remove(leaf_index)
+            # parents without neighbours left are already queued
+            if len(parent_neighbour_indices) == 1:
+                leaf_indices.append(parent_index)
+        return child_indices, tree_root_indices
 
-    def find_label_border_polygonal_chains(
-        self, label: Label
+    @classmethod
+    def _link_polygonal_chains(
+        cls, segments: typing.Iterable[LineSegment]
     ) -> typing.Iterator[PolygonalChain]:
-        neighbour_indices: (  # type: ignore
-            typing.DefaultDict[self._VertexSubindex, typing.Set[self._VertexSubindex]]
-        ) = collections.defaultdict(set)
-        for segment in self._find_label_border_segments(label):
-            vertex_indices = [(i, 0) for i in segment.vertex_indices]
+        neighbour_indices: typing.Dict[int, typing.Set[int]] = collections.defaultdict(
+            set
+        )
+        for segment in segments:
+            vertex_indices = segment.vertex_indices
             neighbour_indices[vertex_indices[0]].add(vertex_indices[1])
             neighbour_indices[vertex_indices[1]].add(vertex_indices[0])
-        junction_counter = 0
-        found_leaf = True
-        while found_leaf:
-            found_leaf = False
-            for leaf_index, leaf_neighbour_indices in neighbour_indices.items():
-                if len(leaf_neighbour_indices) == 1:
-                    found_leaf = True
-                    junction_counter += 1
-                    self._duplicate_border(
-                        neighbour_indices=neighbour_indices,
-                        previous_index=leaf_index,
-                        # pylint: disable=stop-iteration-return; false positive, has 1 item
-                        current_index=next(iter(leaf_neighbour_indices)),
-                        junction_counter=junction_counter,
-                    )
-                    break
-        assert all(len(n) == 2 for n in neighbour_indices.values()), neighbour_indices
+        # dangling branches get traversed out & back
+        # when reaching the vertex they are attached to
+        child_indices, tree_root_indices = cls._peel_branches(neighbour_indices)
+        for root_index in tree_root_indices:
+            chain = collections.deque(cls._branch_tour(child_indices, root_index))
+            chain.rotate()
+            yield PolygonalChain(chain)
+        assert all(
+            len(n) % 2 == 0 for n in neighbour_indices.values()
+        ), neighbour_indices
         while neighbour_indices:
             # pylint: disable=stop-iteration-return; has >= 1 item
-            chain = collections.deque([next(iter(neighbour_indices.keys()))])
-            chain.append(neighbour_indices[chain[0]].pop())
-            neighbour_indices[chain[1]].remove(chain[0])
-            while chain[0] != chain[-1]:
-                previous_index = chain[-1]
-                next_index = neighbour_indices[previous_index].pop()
-                neighbour_indices[next_index].remove(previous_index)
+            start_index = next(iter(neighbour_indices.keys()))
+            chain = collections.deque([start_index])
+            vertex_index = start_index
+            while True:
+                chain.extend(cls._branch_tour(child_indices, vertex_index))
+                next_index = neighbour_indices[vertex_index].pop()
+                neighbour_indices[next_index].remove(vertex_index)
+                for index in (vertex_index, next_index):
+                    if not neighbour_indices[index]:
+                        del neighbour_indices[index]
+                if next_index == start_index:
+                    break
+                assert next_index in neighbour_indices, (next_index, chain)
                 chain.append(next_index)
-                assert not neighbour_indices[previous_index], neighbour_indices[
-                    previous_index
-                ]
-                del neighbour_indices[previous_index]
-            assert not neighbour_indices[chain[0]], neighbour_indices[chain[0]]
-            del neighbour_indices[chain[0]]
-            chain.pop()
-            yield PolygonalChain(v[0] for v in chain)
+                vertex_index = next_index
+            yield PolygonalChain(chain)
 
-    def _unused_vertices(self) -> typing.Set[int]:
-        vertex_indices = set(range(len(self.vertices)))
-        for triangle in self.triangles:
-            for vertex_index in triangle.vertex_indices:
-                vertex_indices.discard(vertex_index)
-        return vertex_indices
-
-    def remove_unused_vertices(self) -> None:
-        vertex_index_conversion = numpy.zeros(len(self.vertices), dtype=int)
-        for vertex_index in sorted(self._unused_vertices(), reverse=True):
-            del self.vertices[vertex_index]
-            vertex_index_conversion[vertex_index] -= 1
-        vertex_index_conversion = numpy.cumsum(vertex_index_conversion)
-        for triangle_index, triangle in enumerate(self.triangles):
-            self.triangles[triangle_index] = Triangle(
-                map(
-                    lambda i: i + int(vertex_index_conversion[i]),
-                    triangle.vertex_indices,
-                )
+    def find_label_border_polygonal_chains(
+        self, label: Label
+    ) -> typing.Iterator[PolygonalChain]:
+        yield from self._link_polygonal_chains(self._find_label_border_segments(label))
+
+    def find_all_label_border_polygonal_chains(
+        self,
+    ) -> typing.Dict[int, typing.List[PolygonalChain]]:
+        """
+        border chains of all labels in annotation, keyed by label index
+
+        Equivalent to calling `find_label_border_polygonal_chains`
+        for every label, but classifies all edges in a single pass.
+        """
+        label_indices, edge_indices = self._label_border_edges()
+        segments = self.edge_table().vertex_indices[edge_indices].tolist()
+        assert self.annotation  # checked by _label_border_edges
+        label_bounds = numpy.stack(
+            (
+                numpy.searchsorted(label_indices, list(self.annotation.labels)),
+                numpy.searchsorted(
+                    label_indices, list(self.annotation.labels), side="right"
+                ),
+            ),
+            axis=1,
+        ).tolist()
+        chains = {}
+        for label_index, (start, stop) in zip(self.annotation.labels, label_bounds):
+            chains[label_index] = list(
+                self._link_polygonal_chains(map(LineSegment, segments[start:stop]))
+            )
+        return chains
+
+    def _used_vertices_mask(self) -> numpy.ndarray:
+        return (
+            numpy.bincount(
+                self.triangle_vertex_indices.ravel(), minlength=len(self.vertices)
             )
+            > 0
+        )
+
+    def _unused_vertices(self) -> typing.Set[int]:
+        return set(numpy.flatnonzero(~self._used_vertices_mask()).tolist())
+
+    def remove_unused_vertices(self) -> numpy.ndarray:
+        """
+        removes vertices not referenced by any triangle
+        and relabels the remaining vertices of triangles & annotation
+
+        returns new vertex indices by previous vertex index
+        (-1 for removed vertices)
+        """
+        used_vertices_mask = self._used_vertices_mask()
+        vertex_index_conversion = numpy.full(len(self.vertices), -1, dtype=numpy.int64)
+        vertex_index_conversion[used_vertices_mask] = numpy.arange(
+            numpy.count_nonzero(used_vertices_mask)
+        )
+        if used_vertices_mask.all():  # keep derived data
+            return vertex_index_conversion
+        if self.annotation:
+            self.annotation.vertex_label_indices = self._vertex_label_indices()[
+                used_vertices_mask
+            ]
+        self._vertices.replace(
+            self.vertex_coordinates[used_vertices_mask], copy_on_write=False
+        )
+        self._triangles.replace(
+            vertex_index_conversion[self.triangle_vertex_indices].astype(numpy.uint32),
+            copy_on_write=False,
+        )
+        return vertex_index_conversion
 
     def select_vertices(
         self, vertex_indices: typing.Iterable[int]
     ) -> typing.List[Vertex]:
         return [self.vertices[idx] for idx in vertex_indices]
 
-    @staticmethod
-    def unite(surfaces: typing.Iterable["Surface"]) -> "Surface":
-        surfaces_iter = iter(surfaces)
-        union = copy.deepcopy(next(surfaces_iter))
-        for surface in surfaces_iter:
-            vertex_index_offset = len(union.vertices)
-            union.vertices.extend(surface.vertices)
-            union.triangles.extend(
-                Triangle(
-                    vertex_idx + vertex_index_offset
-                    for vertex_idx in triangle.vertex_indices
+    def _point_coordinates(self, points: numpy.ndarray) -> numpy.ndarray:
+        points = numpy.asanyarray(points)
+        if points.ndim == 1 and (points.dtype.kind in "iu" or not points.size):
+            return self.vertex_coordinates[points.astype(numpy.intp)]
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(
+                "expected 1-dimensional array of vertex indices"
+                f" or (N, 3) array of coordinates, got {points.shape}"
+            )
+        return points
+
+    def kd_tree(self) -> KDTree:
+        """
+        k-d tree of vertices, cached until `vertices` get modified
+        """
+        return self._derive(
+            "kd_tree",
+            "vertices",
+            lambda: KDTree.from_coordinates(self.vertex_coordinates),
+        )
+
+    def nearest_vertices(
+        self, points: numpy.ndarray, k: int = 1
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        distances to & indices of the `k` nearest vertices of each point
+        as (N, k) arrays, ordered by distance (see `KDTree.query`)
+        """
+        return self.kd_tree().query(self._point_coordinates(points), k=k)
+
+    def vertices_within_radius(
+        self, points: numpy.ndarray, radius: float
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        indices of & distances to the vertices within `radius` of each point
+        as `indptr`, `vertex_indices` & `distances` (see `KDTree.query_radius`)
+        """
+        return self.kd_tree().query_radius(
+            self._point_coordinates(points), radius=radius
+        )
+
+    def distances_mm(
+        self,
+        sources: numpy.ndarray,
+        targets: numpy.ndarray,
+        dtype: typing.Type[numpy.floating] = numpy.float64,
+        max_block_bytes: int = 2**20,
+    ) -> numpy.ndarray:
+        """
+        (S, T) matrix of euclidean distances between sources & targets,
+        given either as arrays of vertex indices or (N, 3) arrays of coordinates
+
+        Computed in blocks of sources,
+        limiting temporary arrays to roughly `max_block_bytes`
+        (at least two rows of `len(targets)`).
+        Blocks fitting into the CPU cache are faster than large blocks.
+        """
+        distances = numpy.empty((len(sources), len(targets)), dtype=dtype)
+        for start, squared_distances in _squared_distance_blocks(
+            self._point_coordinates(sources),
+            self._point_coordinates(targets),
+            dtype=dtype,
+            max_block_bytes=max_block_bytes,
+        ):
+            numpy.sqrt(
+                squared_distances,
+                out=distances[start : start + len(squared_distances)],
+            )
+        return distances
+
+    def min_distances_mm(
+        self,
+        sources: numpy.ndarray,
+        targets: numpy.ndarray,
+        dtype: typing.Type[numpy.floating] = numpy.float64,
+        max_block_bytes: int = 2**20,
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        euclidean distance from each source to its nearest target
+        and the target's index in `targets`
+        without keeping the (S, T) distance matrix in memory
+        (see `distances_mm`)
+        """
+        if len(targets) == 0:
+            raise ValueError("expected at least one target")
+        min_distances = numpy.empty(len(sources), dtype=dtype)
+        target_indices = numpy.empty(len(sources), dtype=numpy.intp)
+        for start, squared_distances in _squared_distance_blocks(
+            self._point_coordinates(sources),
+            self._point_coordinates(targets),
+            dtype=dtype,
+            max_block_bytes=max_block_bytes,
+        ):
+            stop = start + len(squared_distances)
+            target_indices[start:stop] = squared_distances.argmin(axis=1)
+            min_distances[start:stop] = squared_distances[
+                numpy.arange(len(squared_distances)), target_indices[start:stop]
+            ]
+        return numpy.sqrt(min_distances, out=min_distances), target_indices
+
+    def _triangle_cross_products(self) -> numpy.ndarray:
+        """
+        (T, 3) array of cross products `(b - a) x (c - a)` of triangles `(a, b, c)`,
+        perpendicular to the triangles with twice their areas as lengths,
+        cached until `vertices` or `triangles` get modified
+        """
+
+        def compute() -> numpy.ndarray:
+            coordinates = numpy.asarray(self.vertex_coordinates, dtype=numpy.float64)
+            corners = [
+                numpy.take(coordinates, corner_vertex_indices, axis=0)
+                for corner_vertex_indices in self.triangle_vertex_indices.T
+            ]
+            edges_ab, edges_ac = corners[1] - corners[0], corners[2] - corners[0]
+            # component-wise (faster than numpy.cross for many short vectors)
+            cross_products = numpy.empty_like(edges_ab)
+            for axis in range(3):
+                first_axis, second_axis = (axis + 1) % 3, (axis + 2) % 3
+                numpy.subtract(
+                    edges_ab[:, first_axis] * edges_ac[:, second_axis],
+                    edges_ab[:, second_axis] * edges_ac[:, first_axis],
+                    out=cross_products[:, axis],
+                )
+            cross_products.flags.writeable = False
+            return cross_products
+
+        return self._derive("triangle_cross_products", "geometry", compute)
+
+    def triangle_areas_mm2(self) -> numpy.ndarray:
+        """
+        area of each triangle
+        """
+        cross_products = self._triangle_cross_products()
+        return numpy.sqrt(numpy.einsum("ij,ij->i", cross_products, cross_products)) / 2
+
+    def triangle_normals(self) -> numpy.ndarray:
+        """
+        (T, 3) array of unit normals of triangles,
+        oriented by the order of their vertices (right-hand rule),
+        zero for degenerate triangles
+        """
+        return _normalized_rows(self._triangle_cross_products())
+
+    def vertex_normals(self) -> numpy.ndarray:
+        """
+        (N, 3) array of unit normals of vertices,
+        averaging normals of adjacent triangles weighted by their areas,
+        zero for vertices without triangles
+        """
+        return _normalized_rows(self._sum_by_vertex(self._triangle_cross_products()))
+
+    def _sum_by_vertex(self, triangle_values: numpy.ndarray) -> numpy.ndarray:
+        """
+        (N, C) sums of (T, C) values of each vertex's adjacent triangles
+        """
+        sums = numpy.zeros((len(self.vertices), triangle_values.shape[1]))
+        for corner_vertex_indices in self.triangle_vertex_indices.T:
+            for column_index, column in enumerate(triangle_values.T):
+                sums[:, column_index] += numpy.bincount(
+                    corner_vertex_indices, weights=column, minlength=len(sums)
                 )
-                for triangle in surface.triangles
+        return sums
+
+    def vertex_areas_mm2(self) -> numpy.ndarray:
+        """
+        a third of the summed areas of each vertex's adjacent triangles
+        (like freesurfer's `?h.area` files)
+        """
+        return self._sum_by_vertex(self.triangle_areas_mm2()[:, numpy.newaxis] / 3)[
+            :, 0
+        ]
+
+    def area_mm2(self) -> float:
+        """
+        total area of all triangles
+        """
+        return float(self.triangle_areas_mm2().sum())
+
+    def label_areas_mm2(self) -> typing.Dict[int, float]:
+        """
+        area of each label of the loaded annotation, keyed by label index,
+        summing `vertex_areas_mm2()` of the label's vertices
+        """
+        vertex_label_indices = self._vertex_label_indices()
+        labelled_mask = vertex_label_indices != Annotation.UNLABELLED_INDEX
+        assert self.annotation  # checked by _vertex_label_indices
+        label_areas = numpy.bincount(
+            vertex_label_indices[labelled_mask],
+            weights=self.vertex_areas_mm2()[labelled_mask],
+            minlength=max(self.annotation.labels, default=-1) + 1,
+        )
+        return {
+            label_index: float(label_areas[label_index])
+            for label_index in self.annotation.labels
+        }
+
+    def _label_statistics_inputs(
+        self,
+        vertex_label_indices: typing.Optional[numpy.ndarray],
+        overlay: typing.Optional[numpy.ndarray],
+    ) -> typing.Tuple[numpy.ndarray, typing.Optional[numpy.ndarray]]:
+        if vertex_label_indices is None:
+            vertex_label_indices = self._vertex_label_indices()
+        vertex_label_indices = numpy.asarray(vertex_label_indices)
+        if vertex_label_indices.shape != (len(self.vertices),):
+            raise ValueError(
+                f"expected label index for each of {len(self.vertices)} vertices,"
+                f" got array of shape {vertex_label_indices.shape}"
+            )
+        if overlay is not None:
+            overlay = numpy.asarray(overlay)
+            if overlay.shape[:1] != (len(self.vertices),):
+                raise ValueError(
+                    f"expected overlay value(s) for each of {len(self.vertices)}"
+                    f" vertices, got array of shape {overlay.shape}"
+                )
+        return vertex_label_indices, overlay
+
+    def _labels_num(self, vertex_label_indices: numpy.ndarray) -> int:
+        labels_num = int(vertex_label_indices.max(initial=-1)) + 1
+        if self.annotation:
+            labels_num = max(labels_num, max(self.annotation.labels, default=-1) + 1)
+        return labels_num
+
+    def label_statistics(
+        self,
+        vertex_label_indices: typing.Optional[numpy.ndarray] = None,
+        overlay: typing.Optional[numpy.ndarray] = None,
+    ) -> LabelStatistics:
+        """
+        vertex counts, areas, centroids, bounding boxes
+        and mean, standard deviation, minimum & maximum of `overlay` values
+        ((N,) or (N, C) array, e.g. thickness) of all labels at once
+
+        `vertex_label_indices`: label index of each vertex, negative for unlabelled
+        (default: `annotation.vertex_label_indices`)
+
+        Rows of returned arrays refer to label indices
+        (up to the maximum index in `vertex_label_indices` or `annotation.labels`).
+        """
+        vertex_label_indices, overlay = self._label_statistics_inputs(
+            vertex_label_indices, overlay
+        )
+        # pylint: disable=protected-access
+        return LabelStatistics._from_groups(
+            _VertexGroups(
+                groups_num=self._labels_num(vertex_label_indices),
+                group_indices=vertex_label_indices,
+                coordinates=self.vertex_coordinates,
+                areas=self.vertex_areas_mm2(),
+                overlay=overlay,
+            )
+        )
+
+    @staticmethod
+    def label_statistics_many(
+        surfaces: typing.Sequence["Surface"],
+        vertex_label_indices: typing.Optional[typing.Sequence[numpy.ndarray]] = None,
+        overlays: typing.Optional[typing.Sequence[numpy.ndarray]] = None,
+    ) -> typing.List[LabelStatistics]:
+        """
+        `label_statistics()` of multiple surfaces (e.g., subjects)
+        computed with one grouped reduction over all vertices,
+        all results have the same number of rows
+        """
+        # pylint: disable=protected-access
+        if not surfaces:
+            return []
+        inputs = [
+            surface._label_statistics_inputs(
+                None if vertex_label_indices is None else vertex_label_indices[i],
+                None if overlays is None else overlays[i],
+            )
+            for i, surface in enumerate(surfaces)
+        ]
+        labels_num = max(
+            surface._labels_num(surface_vertex_label_indices)
+            for surface, (surface_vertex_label_indices, _) in zip(surfaces, inputs)
+        )
+        group_indices = [
+            numpy.where(
+                surface_vertex_label_indices >= 0,
+                surface_vertex_label_indices + surface_index * labels_num,
+                -1,
             )
+            for surface_index, (surface_vertex_label_indices, _) in enumerate(inputs)
+        ]
+        return LabelStatistics._from_groups(
+            _VertexGroups(
+                groups_num=len(surfaces) * labels_num,
+                group_indices=numpy.concatenate(group_indices),
+                coordinates=numpy.concatenate([s.vertex_coordinates for s in surfaces]),
+                areas=numpy.concatenate([s.vertex_areas_mm2() for s in surfaces]),
+                overlay=(
+                    None
+                    if overlays is None
+                    else numpy.concatenate([overlay for _, overlay in inputs])
+                ),
+            )
+        )._split(len(surfaces))
+
+    def _weld_vertices(self) -> None:
+        """
+        merges vertices with identical coordinates, keeping the order of first occurence
+        """
+        # + 0.0 replaces -0.0
+        vertex_coordinates = self.vertex_coordinates + 0.0
+        # stable, so the first vertex of each group of equal vertices has the lowest index
+        sort_order = numpy.lexsort(vertex_coordinates.T[::-1])
+        sorted_coordinates = vertex_coordinates[sort_order]
+        group_starts_mask = numpy.ones(len(sort_order), dtype=bool)
+        group_starts_mask[1:] = numpy.any(
+            sorted_coordinates[1:] != sorted_coordinates[:-1], axis=1
+        )
+        unique_indices = numpy.empty_like(sort_order)
+        unique_indices[sort_order] = numpy.cumsum(group_starts_mask) - 1
+        first_indices = sort_order[group_starts_mask]
+        order = numpy.argsort(first_indices)
+        vertex_index_conversion = numpy.empty_like(order)
+        vertex_index_conversion[order] = numpy.arange(len(order))
+        if self.annotation:
+            self.annotation.vertex_label_indices = self._vertex_label_indices()[
+                first_indices[order]
+            ]
+        self._triangles.replace(
+            vertex_index_conversion[unique_indices][
+                self.triangle_vertex_indices
+            ].astype(numpy.uint32),
+            copy_on_write=False,
+        )
+        self._vertices.replace(
+            self.vertex_coordinates[first_indices[order]], copy_on_write=False
+        )
+
+    @staticmethod
+    def _concatenate(
+        surfaces: typing.List["Surface"],
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        vertex_index_bounds = numpy.cumsum(
+            [0] + [len(s.vertices) for s in surfaces]
+        ).tolist()
+        triangle_index_bounds = numpy.cumsum(
+            [0] + [len(s.triangles) for s in surfaces]
+        ).tolist()
+        vertex_coordinates = numpy.empty(
+            (vertex_index_bounds[-1], 3), dtype=numpy.float64
+        )
+        triangle_vertex_indices = numpy.empty(
+            (triangle_index_bounds[-1], 3), dtype=numpy.uint32
+        )
+        for surface, vertex_start, vertex_stop, triangle_start, triangle_stop in zip(
+            surfaces,
+            vertex_index_bounds,
+            vertex_index_bounds[1:],
+            triangle_index_bounds,
+            triangle_index_bounds[1:],
+        ):
+            vertex_coordinates[vertex_start:vertex_stop] = surface.vertex_coordinates
+            numpy.add(
+                surface.triangle_vertex_indices,
+                vertex_start,
+                out=triangle_vertex_indices[triangle_start:triangle_stop],
+                casting="unsafe",
+            )
+        return vertex_coordinates, triangle_vertex_indices
+
+    @classmethod
+    def unite(
+        cls, surfaces: typing.Iterable["Surface"], weld_vertices: bool = False
+    ) -> "Surface":
+        """
+        concatenates vertices & triangles of surfaces,
+        keeping the metadata (creator, volume geometry, annotation...) of the first
+
+        `weld_vertices`: merge vertices with identical coordinates
+        (e.g., along borders shared by surfaces)
+        """
+        surfaces = list(surfaces)
+        if not surfaces:
+            raise ValueError("expected at least one surface")
+        union = cls()
+        union.creator = surfaces[0].creator
+        union.creation_datetime = surfaces[0].creation_datetime
+        union.using_old_real_ras = surfaces[0].using_old_real_ras
+        union.volume_geometry_info = surfaces[0].volume_geometry_info
+        union.command_lines = list(surfaces[0].command_lines)
+        union.annotation = copy.deepcopy(surfaces[0].annotation)
+        vertex_coordinates, triangle_vertex_indices = cls._concatenate(surfaces)
+        union._vertices.replace(vertex_coordinates, copy_on_write=False)
+        union._triangles.replace(triangle_vertex_indices, copy_on_write=False)
+        if weld_vertices:
+            union._weld_vertices()
         return union
@@ -54,7 +54,19 @@ def unite_surfaces():
     argparser.add_argument(
         "--output", metavar="OUTPUT_PATH", dest="output_path", required=True
     )
+    argparser.add_argument(
+        "--weld-vertices",
+        action="store_true",
+        help="merge vertices with identical coordinates",
+    )
     argparser.add_argument("input_paths", metavar="INPUT_PATH", nargs="+")
     args = argparser.parse_args()
-    union = Surface.unite(Surface.read_triangular(p) for p in args.input_paths)
-    union.write_triangular(args.output_path)
+    if args.weld_vertices:
+        union = Surface.unite(
+            (Surface.read_triangular(p) for p in args.input_paths),
+            weld_vertices=True,
+        )
+        union.write_triangular(args.output_path)
+    else:
+        # copies vertex & triangle blocks without loading all surfaces into memory
+        Surface.unite_triangular_files(args.input_paths, args.output_path)
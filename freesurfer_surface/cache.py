@@ -0,0 +1,300 @@
+# freesurfer-surface - Read and Write Surface Files in Freesurfer’s TriangularSurface Format
+#
+# Copyright (C) 2020 Fabian Peter Hammerle <fabian@hammerle.me>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+import collections
+import copy
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import typing
+
+import numpy
+
+from freesurfer_surface import Annotation, Surface
+
+
+class SurfaceCache:
+    """
+    on-disk cache of decoded surface files
+
+    `open_triangular` stores vertex coordinates & triangles' vertex indices
+    as native-endian `.npy` files in `directory` and maps them into memory
+    on subsequent calls instead of decoding the surface file again.
+
+    Entries are keyed by a hash of the surface file's entire content
+    (read on every call, preamble & trailing tags get parsed),
+    so changed surface files never return stale arrays.
+    When `max_bytes` is set, least recently used entries get removed
+    after adding a new entry.
+    """
+
+    _VERTICES_FILE_NAME = "vertices.npy"
+    _TRIANGLES_FILE_NAME = "triangles.npy"
+
+    def __init__(self, directory: str, max_bytes: typing.Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    _HASH_CHUNK_SIZE = 2**20
+
+    @classmethod
+    def _scan(
+        cls, surface: Surface, stream: typing.BinaryIO
+    ) -> typing.Tuple[int, int, str]:
+        # pylint: disable=protected-access
+        vertices_num, triangles_num = surface._read_triangular_preamble(stream)
+        vertices_offset = stream.tell()
+        stream.seek(vertices_offset + 4 * 3 * (vertices_num + triangles_num))
+        surface._read_triangular_trailer(stream)
+        stream.seek(0)
+        digest = hashlib.blake2b()
+        for chunk in iter(lambda: stream.read(cls._HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        stream.seek(vertices_offset)
+        return vertices_num, triangles_num, digest.hexdigest()
+
+    def _load_entry(
+        self, entry_path: str
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        vertex_coordinates = numpy.load(
+            os.path.join(entry_path, self._VERTICES_FILE_NAME), mmap_mode="r"
+        )
+        triangle_vertex_indices = numpy.load(
+            os.path.join(entry_path, self._TRIANGLES_FILE_NAME), mmap_mode="r"
+        )
+        os.utime(entry_path)  # mark as recently used
+        return vertex_coordinates, triangle_vertex_indices
+
+    def _store_entry(
+        self,
+        entry_path: str,
+        vertex_coordinates: numpy.ndarray,
+        triangle_vertex_indices: numpy.ndarray,
+    ) -> None:
+        # write to temporary directory & rename it to prevent concurrent readers
+        # from mapping incomplete files
+        temporary_path = tempfile.mkdtemp(prefix=".", dir=self.directory)
+        numpy.save(
+            os.path.join(temporary_path, self._VERTICES_FILE_NAME), vertex_coordinates
+        )
+        numpy.save(
+            os.path.join(temporary_path, self._TRIANGLES_FILE_NAME),
+            triangle_vertex_indices,
+        )
+        try:
+            os.rename(temporary_path, entry_path)
+        except OSError:  # entry added concurrently
+            shutil.rmtree(temporary_path, ignore_errors=True)
+
+    @staticmethod
+    def _entry_size(entry_path: str) -> int:
+        try:
+            with os.scandir(entry_path) as entry_files:
+                return sum(entry_file.stat().st_size for entry_file in entry_files)
+        except FileNotFoundError:  # removed concurrently
+            return 0
+
+    def _evict(self, keep_entry_name: str) -> None:
+        if self.max_bytes is None:
+            return
+        entries = []
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                try:
+                    last_used_ns = entry.stat().st_mtime_ns
+                except FileNotFoundError:  # pragma: no cover
+                    continue
+                entries.append((last_used_ns, entry.name, self._entry_size(entry.path)))
+        total_size = sum(size for _, _, size in entries)
+        for _, entry_name, size in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            if entry_name != keep_entry_name:
+                shutil.rmtree(
+                    os.path.join(self.directory, entry_name), ignore_errors=True
+                )
+                total_size -= size
+
+    def clear(self) -> None:
+        """
+        remove all entries
+        """
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if not entry.name.startswith(".") and entry.is_dir():
+                    shutil.rmtree(entry.path, ignore_errors=True)
+
+    def open_triangular(self, surface_file_path: str) -> Surface:
+        """
+        Equivalent to `Surface.read_triangular(surface_file_path)`.
+
+        When cached, `vertex_coordinates` & `triangle_vertex_indices` are read-only
+        `numpy.memmap` arrays, copied before their first modification.
+        """
+        surface = Surface()
+        with open(surface_file_path, "rb") as surface_file:
+            vertices_num, triangles_num, entry_name = self._scan(surface, surface_file)
+            entry_path = os.path.join(self.directory, entry_name)
+            try:
+                (
+                    surface.vertex_coordinates,
+                    surface.triangle_vertex_indices,
+                ) = self._load_entry(entry_path)
+                return surface
+            except (EOFError, OSError, ValueError):  # missing or corrupt entry
+                shutil.rmtree(entry_path, ignore_errors=True)
+                # pylint: disable=protected-access
+                (
+                    vertex_coordinates,
+                    triangle_vertex_indices,
+                ) = surface._read_triangular_blocks(
+                    surface_file, vertices_num, triangles_num
+                )
+        self._store_entry(entry_path, vertex_coordinates, triangle_vertex_indices)
+        self._evict(keep_entry_name=entry_name)
+        # pylint: disable=protected-access
+        surface._vertices.replace(vertex_coordinates, copy_on_write=False)
+        surface._triangles.replace(triangle_vertex_indices, copy_on_write=False)
+        return surface
+
+
+class MemoryCache:
+    """
+    in-process least recently used cache of surface & annotation files,
+    bounded by the total size of their arrays (`max_bytes`)
+
+    `read_triangular` & `read_annotation` return new `Surface` / `Annotation`
+    objects on every call sharing read-only arrays,
+    which get copied before their first modification.
+    Files are read again when their size or modification time changed.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[
+            typing.Tuple[str, str],
+            typing.Tuple[typing.Tuple[int, int], int, typing.Any],
+        ] = collections.OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        total size of cached arrays
+        """
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def _get(
+        self,
+        file_type: str,
+        file_path: str,
+        load: typing.Callable[[str], typing.Tuple[typing.Any, int]],
+    ) -> typing.Any:
+        key = (file_type, os.path.abspath(file_path))
+        file_stat = os.stat(file_path)
+        fingerprint = (file_stat.st_size, file_stat.st_mtime_ns)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        # a modification while loading changes the file's modification time,
+        # so the outdated fingerprint leads to another reload
+        data, size = load(file_path)
+        with self._lock:
+            if key in self._entries:
+                self._size_bytes -= self._entries.pop(key)[1]
+            if size <= self.max_bytes:
+                self._entries[key] = (fingerprint, size, data)
+                self._size_bytes += size
+                while self._size_bytes > self.max_bytes:
+                    self._size_bytes -= self._entries.popitem(last=False)[1][1]
+        return data
+
+    @staticmethod
+    def _read_only(array: numpy.ndarray) -> numpy.ndarray:
+        array = array.view()
+        array.flags.writeable = False
+        return array
+
+    @classmethod
+    def _load_surface(cls, surface_file_path: str) -> typing.Tuple[Surface, int]:
+        surface = Surface.read_triangular(surface_file_path)
+        surface.vertex_coordinates = cls._read_only(surface.vertex_coordinates)
+        surface.triangle_vertex_indices = cls._read_only(
+            surface.triangle_vertex_indices
+        )
+        return (
+            surface,
+            surface.vertex_coordinates.nbytes + surface.triangle_vertex_indices.nbytes,
+        )
+
+    def read_triangular(self, surface_file_path: str) -> Surface:
+        """
+        Equivalent to `Surface.read_triangular(surface_file_path)`.
+        """
+        cached = self._get("surface", surface_file_path, self._load_surface)
+        surface = Surface()
+        surface.creator = cached.creator
+        surface.creation_datetime = cached.creation_datetime
+        surface.using_old_real_ras = cached.using_old_real_ras
+        surface.volume_geometry_info = cached.volume_geometry_info
+        surface.command_lines = list(cached.command_lines)
+        surface.vertex_coordinates = cached.vertex_coordinates
+        surface.triangle_vertex_indices = cached.triangle_vertex_indices
+        return surface
+
+    @classmethod
+    def _load_annotation(
+        cls, annotation_file_path: str
+    ) -> typing.Tuple[Annotation, int]:
+        annotation = Annotation.read(annotation_file_path)
+        annotation.vertex_label_indices = cls._read_only(
+            annotation.vertex_label_indices
+        )
+        return annotation, annotation.vertex_label_indices.nbytes
+
+    def read_annotation(self, annotation_file_path: str) -> Annotation:
+        """
+        Equivalent to `Annotation.read(annotation_file_path)`.
+        """
+        cached = self._get("annotation", annotation_file_path, self._load_annotation)
+        annotation = Annotation()
+        annotation.colortable_path = cached.colortable_path
+        annotation.labels = copy.deepcopy(cached.labels)
+        annotation.vertex_label_indices = cached.vertex_label_indices
+        return annotation
@@ -0,0 +1,424 @@
+# freesurfer-surface - Read and Write Surface Files in Freesurfer’s TriangularSurface Format
+#
+# Copyright (C) 2020 Fabian Peter Hammerle <fabian@hammerle.me>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+import dataclasses
+import typing
+
+import numpy
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class KDTree:
+    """
+    balanced k-d tree of vertices for nearest vertex & radius queries
+    (see `Surface.kd_tree()`)
+
+    Nodes are stored in breadth-first order (children of node `n` are
+    `2 * n + 1` & `2 * n + 2`) with bounding boxes `node_mins` & `node_maxs`.
+    Inner nodes are split along `split_axes`.
+    All leaves have depth `depth`, leaf `l` (node `2 ** depth - 1 + l`)
+    contains the vertices `vertex_indices[leaf_indptr[l]:leaf_indptr[l + 1]]`
+    located at `coordinates[leaf_indptr[l]:leaf_indptr[l + 1]]`.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    depth: int
+    split_axes: numpy.ndarray
+    node_mins: numpy.ndarray
+    node_maxs: numpy.ndarray
+    leaf_indptr: numpy.ndarray
+    vertex_indices: numpy.ndarray
+    coordinates: numpy.ndarray
+
+    _LEAF_SIZE = 16
+    _MAX_BLOCK_SIZE = 2**18
+
+    @staticmethod
+    def _level_indptr(vertices_num: int, level: int) -> numpy.ndarray:
+        # sizes of nodes in the same level differ by at most one
+        return (numpy.arange(2**level + 1) * vertices_num) // 2**level
+
+    @staticmethod
+    def _bounding_boxes(
+        coordinates: numpy.ndarray, leaf_indptr: numpy.ndarray, depth: int
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        # leaves' boxes merged bottom-up
+        node_mins = numpy.full((2 ** (depth + 1) - 1, 3), numpy.inf)
+        node_maxs = numpy.full((2 ** (depth + 1) - 1, 3), -numpy.inf)
+        if len(coordinates):
+            node_mins[2**depth - 1 :] = numpy.minimum.reduceat(
+                coordinates, leaf_indptr[:-1]
+            )
+            node_maxs[2**depth - 1 :] = numpy.maximum.reduceat(
+                coordinates, leaf_indptr[:-1]
+            )
+        for level in reversed(range(depth)):
+            nodes = slice(2**level - 1, 2 ** (level + 1) - 1)
+            children = slice(2 ** (level + 1) - 1, 2 ** (level + 2) - 1)
+            node_mins[nodes] = numpy.minimum(
+                node_mins[children][0::2], node_mins[children][1::2]
+            )
+            node_maxs[nodes] = numpy.maximum(
+                node_maxs[children][0::2], node_maxs[children][1::2]
+            )
+        return node_mins, node_maxs
+
+    @classmethod
+    def from_coordinates(cls, coordinates: numpy.ndarray) -> KDTree:
+        """
+        build tree of (N, 3) array of vertex coordinates
+        (indices in `vertex_indices` refer to rows of `coordinates`)
+        """
+        coordinates = numpy.asarray(coordinates, dtype=float).reshape((-1, 3))
+        vertices_num = len(coordinates)
+        depth = max(
+            0, int(numpy.ceil(numpy.log2(max(vertices_num, 1) / cls._LEAF_SIZE)))
+        )
+        vertex_indices = numpy.arange(vertices_num)
+        split_axes = numpy.empty(2**depth - 1, dtype=numpy.intp)
+        for level in range(depth):
+            # split all nodes of the level at the median of their widest axis
+            node_starts = cls._level_indptr(vertices_num, level)[:-1]
+            node_coordinates = coordinates[vertex_indices]
+            level_split_axes = split_axes[2**level - 1 : 2 ** (level + 1) - 1]
+            numpy.argmax(
+                numpy.maximum.reduceat(node_coordinates, node_starts)
+                - numpy.minimum.reduceat(node_coordinates, node_starts),
+                axis=1,
+                out=level_split_axes,
+            )
+            node_indices = numpy.repeat(
+                numpy.arange(2**level), numpy.diff(node_starts, append=vertices_num)
+            )
+            vertex_indices = vertex_indices[
+                numpy.lexsort(
+                    (
+                        node_coordinates[
+                            numpy.arange(vertices_num), level_split_axes[node_indices]
+                        ],
+                        node_indices,
+                    )
+                )
+            ]
+        coordinates = coordinates[vertex_indices]
+        leaf_indptr = cls._level_indptr(vertices_num, depth)
+        node_mins, node_maxs = cls._bounding_boxes(coordinates, leaf_indptr, depth)
+        return cls(
+            depth=depth,
+            split_axes=split_axes,
+            node_mins=node_mins,
+            node_maxs=node_maxs,
+            leaf_indptr=leaf_indptr,
+            vertex_indices=vertex_indices,
+            coordinates=coordinates,
+        )
+
+    def _descend(
+        self, points: numpy.ndarray
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        leaves of points and distances to the borders of their ancestors' cells
+        (regions containing vertices of the node only) by level
+        """
+        point_indices = numpy.arange(len(points))
+        nodes = numpy.zeros(len(points), dtype=numpy.intp)
+        margins = numpy.full((len(points), self.depth + 1), numpy.inf)
+        for level in range(self.depth):
+            split_axes = self.split_axes[nodes]
+            values = points[point_indices, split_axes]
+            # distances to the right child's minimum & the left child's maximum
+            left_margins = self.node_mins[2 * nodes + 2, split_axes] - values
+            right_margins = values - self.node_maxs[2 * nodes + 1, split_axes]
+            right = right_margins > left_margins
+            nodes = 2 * nodes + 1 + right
+            numpy.minimum(
+                margins[:, level],
+                numpy.where(right, right_margins, left_margins),
+                out=margins[:, level + 1],
+            )
+        return nodes, margins
+
+    def _ancestors(
+        self, nodes: numpy.ndarray, levels: typing.Union[int, numpy.ndarray]
+    ) -> numpy.ndarray:
+        """
+        ancestors of leaves in given levels
+        """
+        return ((nodes + 1) >> (self.depth - levels)) - 1
+
+    def _box_squared_distances(
+        self, points: numpy.ndarray, nodes: numpy.ndarray
+    ) -> numpy.ndarray:
+        gaps = numpy.take(self.node_mins, nodes, axis=0)
+        upper_gaps = numpy.take(self.node_maxs, nodes, axis=0)
+        numpy.subtract(gaps, points, out=gaps)
+        numpy.subtract(points, upper_gaps, out=upper_gaps)
+        numpy.maximum(gaps, upper_gaps, out=gaps)
+        numpy.maximum(gaps, 0, out=gaps)
+        return numpy.einsum("ij,ij->i", gaps, gaps)
+
+    def _squared_distances(
+        self, points: numpy.ndarray, positions: numpy.ndarray
+    ) -> numpy.ndarray:
+        differences = numpy.take(self.coordinates, positions, axis=0)
+        differences -= points
+        return numpy.einsum("...j,...j->...", differences, differences)
+
+    def _initial_squared_bounds(
+        self, points: numpy.ndarray, leaves: numpy.ndarray, k: int
+    ) -> numpy.ndarray:
+        """
+        squared distance of each point's k-th nearest vertex
+        within the ancestor of its leaf in the deepest level with at least k vertices
+        """
+        level = self.depth
+        while len(self.vertex_indices) // 2**level < k:
+            level -= 1
+        first_leaves = self._ancestors(leaves, level) - (2**level - 1)
+        first_leaves <<= self.depth - level
+        _, squared_distances = self._range_squared_distances(
+            points,
+            self.leaf_indptr[first_leaves],
+            self.leaf_indptr[first_leaves + (1 << (self.depth - level))],
+        )
+        return numpy.partition(squared_distances, k - 1, axis=1)[:, k - 1]
+
+    def _range_squared_distances(
+        self, points: numpy.ndarray, starts: numpy.ndarray, ends: numpy.ndarray
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        squared distances between each point & the vertices at positions
+        `starts[i]:ends[i]` as (N, max(ends - starts)) arrays,
+        padded with infinite distances
+        """
+        positions = starts[:, numpy.newaxis] + numpy.arange(
+            (ends - starts).max(initial=0)
+        )
+        squared_distances = self._squared_distances(
+            points[:, numpy.newaxis],
+            numpy.minimum(positions, len(self.vertex_indices) - 1),
+        )
+        squared_distances[positions >= ends[:, numpy.newaxis]] = numpy.inf
+        return positions, squared_distances
+
+    def _candidates(
+        self,
+        points: numpy.ndarray,
+        squared_bounds: numpy.ndarray,
+        nearest_num: typing.Optional[int] = None,
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        point indices, positions in `vertex_indices` and squared distances
+        of vertices within `squared_bounds` of `points`
+
+        `nearest_num`: tighten bounds to the distances of the `nearest_num`-th
+        nearest vertices within the points' leaves (or their ancestors)
+        and to the farthest corners of nodes containing at least `nearest_num`
+        vertices while descending
+        """
+        leaves, margins = self._descend(points)
+        if nearest_num is not None:
+            squared_bounds = numpy.minimum(
+                squared_bounds,
+                self._initial_squared_bounds(points, leaves, nearest_num),
+            )
+        # start at the deepest ancestor whose cell contains the ball around the point
+        radii = numpy.sqrt(numpy.maximum(squared_bounds, 0))
+        nodes = self._ancestors(
+            leaves, (margins > radii[:, numpy.newaxis]).sum(axis=1) - 1
+        )
+        point_indices, leaves = self._visit_leaves(
+            points, squared_bounds, nodes, nearest_num
+        )
+        positions, squared_distances = self._range_squared_distances(
+            points[point_indices],
+            self.leaf_indptr[leaves],
+            self.leaf_indptr[leaves + 1],
+        )
+        rows, columns = numpy.nonzero(
+            squared_distances <= squared_bounds[point_indices, numpy.newaxis]
+        )
+        return (
+            point_indices[rows],
+            positions[rows, columns],
+            squared_distances[rows, columns],
+        )
+
+    def _visit_leaves(
+        self,
+        points: numpy.ndarray,
+        squared_bounds: numpy.ndarray,
+        nodes: numpy.ndarray,
+        nearest_num: typing.Optional[int],
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        point indices & leaves within `squared_bounds` of the points,
+        descending from `nodes` breadth-first
+        """
+        point_indices = numpy.arange(len(points))
+        found_point_indices, found_leaves = [point_indices[:0]], [nodes[:0]]
+        while point_indices.size:
+            mask = (
+                self._box_squared_distances(points[point_indices], nodes)
+                <= squared_bounds[point_indices]
+            )
+            point_indices, nodes = point_indices[mask], nodes[mask]
+            if nearest_num is not None and point_indices.size:
+                bounded_point_indices, corner_bounds = self._corner_squared_bounds(
+                    points, point_indices, nodes, nearest_num
+                )
+                squared_bounds[bounded_point_indices] = numpy.minimum(
+                    squared_bounds[bounded_point_indices], corner_bounds
+                )
+            leaf_mask = nodes >= 2**self.depth - 1
+            found_point_indices.append(point_indices[leaf_mask])
+            found_leaves.append(nodes[leaf_mask] - (2**self.depth - 1))
+            point_indices = numpy.repeat(point_indices[~leaf_mask], 2)
+            nodes = numpy.repeat(nodes[~leaf_mask] * 2 + 1, 2)
+            nodes[1::2] += 1
+        return numpy.concatenate(found_point_indices), numpy.concatenate(found_leaves)
+
+    def _corner_squared_bounds(
+        self,
+        points: numpy.ndarray,
+        point_indices: numpy.ndarray,
+        nodes: numpy.ndarray,
+        nearest_num: int,
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        indices of points & squared distance of each point to the farthest corner
+        of its nearest node containing at least `nearest_num` vertices
+        (upper bound of the distance to its `nearest_num`-th nearest vertex)
+        """
+        # nodes are grouped by point index
+        gaps = numpy.take(self.node_maxs, nodes, axis=0)
+        lower_gaps = numpy.take(self.node_mins, nodes, axis=0)
+        node_points = points[point_indices]
+        gaps -= node_points
+        numpy.subtract(node_points, lower_gaps, out=lower_gaps)
+        numpy.maximum(gaps, lower_gaps, out=gaps)
+        corner_squared_distances = numpy.einsum("ij,ij->i", gaps, gaps)
+        node_levels = numpy.log2(nodes + 1).astype(numpy.intp)
+        # nodes in the same level contain at least floor(vertices_num / 2**level)
+        corner_squared_distances[
+            (len(self.vertex_indices) >> node_levels) < nearest_num
+        ] = numpy.inf
+        group_starts = numpy.flatnonzero(numpy.diff(point_indices, prepend=-1))
+        return (
+            point_indices[group_starts],
+            numpy.minimum.reduceat(corner_squared_distances, group_starts),
+        )
+
+    @staticmethod
+    def _points(points: numpy.ndarray) -> numpy.ndarray:
+        points = numpy.asanyarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(
+                f"expected (N, 3) array of coordinates, got {points.shape}"
+            )
+        return points
+
+    @staticmethod
+    def _select_nearest(
+        points_num: int,
+        k: int,
+        point_indices: numpy.ndarray,
+        positions: numpy.ndarray,
+        squared_distances: numpy.ndarray,
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        distances & positions of the `k` nearest of at least `k` candidates per point
+        as (points_num, k) arrays
+
+        Selects the minimum of each point's candidates `k` times
+        (faster than sorting all candidates for small `k`).
+        """
+        # candidates are grouped by level of leaf & sorted by point index within groups
+        order = numpy.argsort(point_indices, kind="stable")
+        point_indices = point_indices[order]
+        positions = positions[order]
+        squared_distances = squared_distances[order]
+        candidates_nums = numpy.bincount(point_indices, minlength=points_num)
+        group_starts = numpy.cumsum(candidates_nums) - candidates_nums
+        distances = numpy.empty((points_num, k))
+        nearest = numpy.empty((points_num, k), dtype=numpy.intp)
+        for rank in range(k):
+            min_squared_distances = numpy.minimum.reduceat(
+                squared_distances, group_starts
+            )
+            (ties,) = numpy.nonzero(
+                squared_distances
+                == numpy.repeat(min_squared_distances, candidates_nums)
+            )
+            # the last of tied candidates wins
+            nearest[point_indices[ties], rank] = ties
+            numpy.sqrt(min_squared_distances, out=distances[:, rank])
+            squared_distances[nearest[:, rank]] = numpy.inf
+        return distances, positions[nearest]
+
+    def query(
+        self, points: numpy.ndarray, k: int = 1
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        distances to & indices of the `k` nearest vertices of each point
+        as (N, k) arrays, ordered by distance
+        """
+        points = self._points(points)
+        if not 1 <= k <= len(self.vertex_indices):
+            raise ValueError(f"expected 1 <= k <= {len(self.vertex_indices)}, got {k}")
+        distances = numpy.empty((len(points), k))
+        vertex_indices = numpy.empty((len(points), k), dtype=numpy.intp)
+        block_size = max(1, self._MAX_BLOCK_SIZE // max(k, self._LEAF_SIZE) // 2)
+        for start in range(0, len(points), block_size):
+            block_points = points[start : start + block_size]
+            point_indices, positions, squared_distances = self._candidates(
+                block_points, numpy.full(len(block_points), numpy.inf), nearest_num=k
+            )
+            block_distances, block_positions = self._select_nearest(
+                len(block_points), k, point_indices, positions, squared_distances
+            )
+            distances[start : start + block_size] = block_distances
+            vertex_indices[start : start + block_size] = self.vertex_indices[
+                block_positions
+            ]
+        return distances, vertex_indices
+
+    def query_radius(
+        self, points: numpy.ndarray, radius: float
+    ) -> typing.Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        indices of & distances to the vertices within `radius` of each point
+        in compressed sparse row format, ordered by vertex index:
+        `vertex_indices[indptr[i]:indptr[i + 1]]` are near `points[i]`
+
+        returns `indptr`, `vertex_indices` & `distances`
+        """
+        points = self._points(points)
+        point_indices, positions, squared_distances = self._candidates(
+            points,
+            numpy.full(len(points), float(radius) ** 2 if radius >= 0 else -1.0),
+        )
+        vertex_indices = self.vertex_indices[positions]
+        order = numpy.lexsort((vertex_indices, point_indices))
+        indptr = numpy.zeros(len(points) + 1, dtype=numpy.int64)
+        numpy.cumsum(
+            numpy.bincount(point_indices, minlength=len(points)), out=indptr[1:]
+        )
+        return indptr, vertex_indices[order], numpy.sqrt(squared_distances[order])
@@ -0,0 +1,145 @@
+# freesurfer-surface - Read and Write Surface Files in Freesurfer’s TriangularSurface Format
+#
+# Copyright (C) 2020 Fabian Peter Hammerle <fabian@hammerle.me>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import dataclasses
+import typing
+
+import numpy
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class _VertexGroups:
+    """
+    per-vertex inputs of `LabelStatistics`,
+    vertices grouped by `group_indices` (negative for ungrouped)
+    """
+
+    groups_num: int
+    group_indices: numpy.ndarray
+    coordinates: numpy.ndarray
+    areas: numpy.ndarray
+    overlay: typing.Optional[numpy.ndarray]
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class LabelStatistics:
+    """
+    statistics of the vertices of each label (see `Surface.label_statistics()`),
+    row `i` refers to label index `i`
+
+    `vertex_counts`: number of vertices
+    `areas_mm2`: summed `Surface.vertex_areas_mm2()`
+    `centroids`: (L, 3) mean coordinates
+    `bounding_box_mins` & `bounding_box_maxs`: (L, 3) extreme coordinates
+    `overlay_means`, `overlay_stds`, `overlay_mins` & `overlay_maxs`:
+    reductions of per-vertex overlay values (`None` without overlay)
+
+    Means, standard deviations & extremes of labels without vertices are NaN.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    vertex_counts: numpy.ndarray
+    areas_mm2: numpy.ndarray
+    centroids: numpy.ndarray
+    bounding_box_mins: numpy.ndarray
+    bounding_box_maxs: numpy.ndarray
+    overlay_means: typing.Optional[numpy.ndarray] = None
+    overlay_stds: typing.Optional[numpy.ndarray] = None
+    overlay_mins: typing.Optional[numpy.ndarray] = None
+    overlay_maxs: typing.Optional[numpy.ndarray] = None
+
+    @staticmethod
+    def _reduce(
+        ufunc: numpy.ufunc,
+        sorted_values: numpy.ndarray,
+        vertex_counts: numpy.ndarray,
+        fill_value: float = numpy.nan,
+    ) -> numpy.ndarray:
+        """
+        reduce consecutive groups of `vertex_counts` values
+        """
+        nonempty_mask = vertex_counts > 0
+        reduced = numpy.full(
+            (len(vertex_counts),) + sorted_values.shape[1:],
+            fill_value,
+            dtype=numpy.float64,
+        )
+        reduced[nonempty_mask] = ufunc.reduceat(
+            sorted_values,
+            (numpy.cumsum(vertex_counts) - vertex_counts)[nonempty_mask],
+            axis=0,
+        )
+        return reduced
+
+    @classmethod
+    def _mean(
+        cls, sorted_values: numpy.ndarray, vertex_counts: numpy.ndarray
+    ) -> numpy.ndarray:
+        return cls._reduce(numpy.add, sorted_values, vertex_counts) / (
+            vertex_counts.reshape((-1,) + (1,) * (sorted_values.ndim - 1))
+        )
+
+    @classmethod
+    def _from_groups(cls, groups: _VertexGroups) -> "LabelStatistics":
+        """
+        statistics of each group of vertices
+        with grouped reductions over vertices sorted by group
+        """
+        (vertex_indices,) = numpy.nonzero(groups.group_indices >= 0)
+        order = vertex_indices[
+            numpy.argsort(groups.group_indices[vertex_indices], kind="stable")
+        ]
+        vertex_counts = numpy.bincount(
+            groups.group_indices[order], minlength=groups.groups_num
+        )
+        coordinates = numpy.asarray(groups.coordinates, dtype=numpy.float64)[order]
+        statistics = cls(
+            vertex_counts=vertex_counts,
+            areas_mm2=cls._reduce(numpy.add, groups.areas[order], vertex_counts, 0),
+            centroids=cls._mean(coordinates, vertex_counts),
+            bounding_box_mins=cls._reduce(numpy.minimum, coordinates, vertex_counts),
+            bounding_box_maxs=cls._reduce(numpy.maximum, coordinates, vertex_counts),
+        )
+        if groups.overlay is None:
+            return statistics
+        overlay = numpy.asarray(groups.overlay, dtype=numpy.float64)[order]
+        means = cls._mean(overlay, vertex_counts)
+        # deviations from the means avoid cancellation in sums of squares
+        deviations = overlay - numpy.repeat(means, vertex_counts, axis=0)
+        return dataclasses.replace(
+            statistics,
+            overlay_means=means,
+            overlay_stds=numpy.sqrt(cls._mean(numpy.square(deviations), vertex_counts)),
+            overlay_mins=cls._reduce(numpy.minimum, overlay, vertex_counts),
+            overlay_maxs=cls._reduce(numpy.maximum, overlay, vertex_counts),
+        )
+
+    def _split(self, parts_num: int) -> typing.List["LabelStatistics"]:
+        """
+        split statistics of groups `part_index * labels_num + label_index`
+        """
+        labels_num = len(self.vertex_counts) // parts_num
+        parts = []
+        for part_index in range(parts_num):
+            rows = slice(part_index * labels_num, (part_index + 1) * labels_num)
+            fields: typing.Dict[str, typing.Any] = {}
+            for field in dataclasses.fields(self):
+                values = getattr(self, field.name)
+                fields[field.name] = None if values is None else values[rows]
+            parts.append(type(self)(**fields))
+        return parts
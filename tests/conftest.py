@@ -15,9 +15,37 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import datetime
 import os
+import typing
+
+from freesurfer_surface import Surface, Triangle, Vertex
 
 SUBJECTS_DIR = os.path.join(os.path.dirname(__file__), "subjects")
 
 ANNOTATION_FILE_PATH = os.path.join(SUBJECTS_DIR, "fabian", "label", "lh.aparc.annot")
 SURFACE_FILE_PATH = os.path.join(SUBJECTS_DIR, "fabian", "surf", "lh.pial")
+
+
+def write_example_surface(
+    surface_file_path: str, vertices: typing.Optional[typing.List[Vertex]] = None
+) -> Surface:
+    surface = Surface()
+    surface.creator = b"pytest"
+    surface.creation_datetime = datetime.datetime(2021, 5, 22, 7, 52, 53)
+    if vertices is None:
+        vertices = [
+            Vertex(0.0, 0.0, 0.0),
+            Vertex(1.0, 2.0, 3.0),
+            Vertex(2.0, 4.0, 6.0),
+            Vertex(3.0, 5.0, 7.0),
+        ]
+    surface.vertices = vertices
+    surface.triangles = [Triangle((0, 1, 2)), Triangle((0, 1, 3))]
+    surface.using_old_real_ras = True
+    surface.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+    surface.command_lines = [b"?", b"!"]
+    surface.write_triangular(
+        surface_file_path, creation_datetime=surface.creation_datetime
+    )
+    return surface
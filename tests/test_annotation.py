@@ -15,8 +15,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import asyncio
+import io
+import struct
+
+import numpy
+import pytest
+
 from conftest import ANNOTATION_FILE_PATH
-from freesurfer_surface import Annotation
+from freesurfer_surface import Annotation, AnnotationHeader, Label
+
+# pylint: disable=protected-access
 
 
 def test_load_annotation():
@@ -76,3 +85,163 @@ def test_load_annotation():
         lambda l: l.color_code == 10542100, annotation.labels.values()
     )
     assert superiorfrontal.name == "superiorfrontal"
+
+
+def test_load_annotation_vertex_label_indices():
+    annotation = Annotation.read(ANNOTATION_FILE_PATH)
+    assert annotation.vertex_label_indices.dtype == numpy.int32
+    assert annotation.vertex_label_indices.shape == (155622,)
+    assert annotation.vertex_label_indices[[64290, 84028, 93859, 78572]].tolist() == [
+        22,
+        24,
+        28,
+        0,
+    ]
+    assert numpy.all(annotation.vertex_label_indices >= 0)
+
+
+def _annotation_stream(annotations, labels) -> io.BytesIO:
+    stream = io.BytesIO()
+    stream.write(struct.pack(">I", len(annotations)))
+    for vertex_index, color_code in annotations:
+        stream.write(struct.pack(">II", vertex_index, color_code))
+    colortable_path = b"colortable.txt"
+    stream.write(Annotation._TAG_OLD_COLORTABLE)
+    stream.write(struct.pack(">iII", -2, len(labels), len(colortable_path) + 1))
+    stream.write(colortable_path + b"\0")
+    stream.write(struct.pack(">I", len(labels)))
+    for index, name, color in labels:
+        stream.write(struct.pack(">II", index, len(name) + 1) + name + b"\0")
+        stream.write(struct.pack(">IIII", *color))
+    stream.seek(0)
+    return stream
+
+
+def test__read_unknown_color_code():
+    annotation = Annotation()
+    annotation._read(
+        _annotation_stream(
+            annotations=[(0, 0x030201), (1, 0x42), (3, 0x060504)],
+            labels=[(1, b"a", (1, 2, 3, 0)), (2, b"b", (4, 5, 6, 0))],
+        )
+    )
+    assert annotation.vertex_label_indices.tolist() == [1, -1, -1, 2]
+    assert annotation.vertex_label_index == {0: 1, 3: 2}
+
+
+def test__read_empty():
+    annotation = Annotation()
+    annotation._read(_annotation_stream(annotations=[], labels=[]))
+    assert not annotation.vertex_label_indices.size
+    assert not annotation.vertex_label_index
+    assert not annotation.labels
+
+
+def test_vertex_label_index_mapping():
+    annotation = Annotation()
+    annotation.vertex_label_index = {3: 7, 1: 2}
+    assert annotation.vertex_label_indices.tolist() == [-1, 2, -1, 7]
+    assert annotation.vertex_label_index == {1: 2, 3: 7}
+    assert len(annotation.vertex_label_index) == 2
+    assert 0 not in annotation.vertex_label_index
+    assert annotation.vertex_label_index.get(-1) is None
+    assert annotation.vertex_label_index.get(4) is None
+    annotation.vertex_label_index[5] = 4
+    del annotation.vertex_label_index[1]
+    assert annotation.vertex_label_indices.tolist() == [-1, -1, -1, 7, -1, 4]
+    assert repr(annotation.vertex_label_index) == "{3: 7, 5: 4}"
+    with pytest.raises(KeyError):
+        del annotation.vertex_label_index[1]
+    with pytest.raises(KeyError):
+        annotation.vertex_label_index[-1] = 2
+    annotation.vertex_label_index = {}
+    assert not annotation.vertex_label_indices.size
+
+
+def test_vertex_label_indices_copy_on_write():
+    vertex_label_indices = numpy.array([0, 1, 1], dtype=numpy.int32)
+    vertex_label_indices.flags.writeable = False
+    annotation = Annotation()
+    annotation.vertex_label_indices = vertex_label_indices
+    assert annotation.vertex_label_index == {0: 0, 1: 1, 2: 1}
+    annotation.vertex_label_index[2] = 3
+    assert vertex_label_indices.tolist() == [0, 1, 1]
+    assert annotation.vertex_label_indices.tolist() == [0, 1, 3]
+    with pytest.raises(ValueError, match=r"\b1-dimensional\b"):
+        annotation.vertex_label_indices = numpy.zeros((2, 2))
+
+
+def test_read_write_same(tmpdir):
+    annotation = Annotation.read(ANNOTATION_FILE_PATH)
+    output_path = tmpdir.join("lh.aparc.annot").strpath
+    annotation.write(output_path)
+    with open(output_path, "rb") as output_file:
+        with open(ANNOTATION_FILE_PATH, "rb") as expected_file:
+            assert expected_file.read() == output_file.read()
+
+
+def test_write_read_unlabelled(tmpdir):
+    annotation = Annotation()
+    annotation.labels = {
+        1: Label(index=1, name="b", red=4, green=5, blue=6, transparency=0),
+        3: Label(index=3, name="a", red=1, green=2, blue=3, transparency=0),
+    }
+    annotation.vertex_label_indices = numpy.array([3, -1, 1, 3, -1], dtype=numpy.int32)
+    output_path = tmpdir.join("annot").strpath
+    annotation.write(output_path)
+    with open(output_path, "rb") as output_file:
+        # pairs of all vertices, color code 0 for unlabelled vertices
+        assert output_file.read(4 + 4 * 2 * 5) == struct.pack(
+            ">11I", 5, 0, 0x030201, 1, 0, 2, 0x060504, 3, 0x030201, 4, 0
+        )
+    resulted_annotation = Annotation.read(output_path)
+    assert resulted_annotation.vertex_label_indices.tolist() == [3, -1, 1, 3, -1]
+    assert resulted_annotation.colortable_path == b""
+    assert resulted_annotation.labels == annotation.labels
+
+
+def test_write_read_empty(tmpdir):
+    output_path = tmpdir.join("annot").strpath
+    Annotation().write(output_path)
+    annotation = Annotation.read(output_path)
+    assert not annotation.vertex_label_index
+    assert not annotation.labels
+
+
+def test_write_missing_label(tmpdir):
+    annotation = Annotation()
+    annotation.labels = {
+        1: Label(index=1, name="a", red=1, green=2, blue=3, transparency=0),
+    }
+    annotation.vertex_label_index = {0: 1, 1: 2, 2: 4}
+    with pytest.raises(ValueError, match=r"\[2, 4\].*\blabels\b"):
+        annotation.write(tmpdir.join("annot").strpath)
+
+
+def test_read_many():
+    annotations = Annotation.read_many([ANNOTATION_FILE_PATH] * 3, workers=2)
+    assert len(annotations) == 3
+    expected = Annotation.read(ANNOTATION_FILE_PATH)
+    for annotation in annotations:
+        assert numpy.array_equal(
+            annotation.vertex_label_indices, expected.vertex_label_indices
+        )
+        assert annotation.labels == expected.labels
+
+
+def test_read_async():
+    annotation = asyncio.run(Annotation.read_async(ANNOTATION_FILE_PATH))
+    expected = Annotation.read(ANNOTATION_FILE_PATH)
+    assert numpy.array_equal(
+        annotation.vertex_label_indices, expected.vertex_label_indices
+    )
+    assert annotation.labels == expected.labels
+
+
+def test_read_header():
+    header = Annotation.read_header(ANNOTATION_FILE_PATH)
+    assert isinstance(header, AnnotationHeader)
+    assert header.annotated_vertices_num == 155622
+    expected = Annotation.read(ANNOTATION_FILE_PATH)
+    assert header.colortable_path == expected.colortable_path
+    assert header.labels == expected.labels
@@ -0,0 +1,39 @@
+# freesurfer-surface - Read and Write Surface Files in Freesurfer’s TriangularSurface Format
+#
+# Copyright (C) 2020 Fabian Peter Hammerle <fabian@hammerle.me>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy
+import pytest
+
+from freesurfer_surface import KDTree
+
+
+def test_kd_tree_empty_queries():
+    kd_tree = KDTree.from_coordinates(
+        numpy.array([[x, y, 0.0] for x in range(4) for y in range(4)])
+    )
+    distances, vertex_indices = kd_tree.query(numpy.zeros((0, 3)), k=3)
+    assert distances.shape == vertex_indices.shape == (0, 3)
+    indptr, vertex_indices, distances = kd_tree.query_radius(numpy.zeros((0, 3)), 1.0)
+    assert indptr.tolist() == [0]
+    assert not vertex_indices.size
+    assert not distances.size
+    with pytest.raises(
+        ValueError, match=r"^expected \(N, 3\) array of coordinates, got \(3,\)$"
+    ):
+        kd_tree.query([0.0, 0.0, 0.0])
+    with pytest.raises(ValueError, match=r"array of coordinates, got \(0,\)$"):
+        kd_tree.query_radius([], 1.0)
@@ -114,3 +114,48 @@ def test_unite_surfaces_script(tmpdir):
     union = Surface.read_triangular(output_path)
     assert len(union.vertices) == 155622 + (5 * 2)
     assert len(union.triangles) == 311240 + (2 * 2)
+
+
+def test_unite_surfaces_function_weld_vertices(tmpdir):
+    input_paths = []
+    for offset in range(2):
+        surface = Surface()
+        surface.creator = b"pytest"
+        surface.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+        for i in range(3):
+            surface.add_vertex(Vertex(i + offset, 0, 0))
+        surface.triangles.append(Triangle((0, 1, 2)))
+        input_paths.append(tmpdir.join(str(offset)).strpath)
+        surface.write_triangular(input_paths[-1])
+    output_path = tmpdir.join("output_path").strpath
+    with unittest.mock.patch(
+        "sys.argv", ["", "--output", output_path, "--weld-vertices", *input_paths]
+    ):
+        unite_surfaces()
+    union = Surface.read_triangular(output_path)
+    assert numpy.allclose(union.vertices, [[0, 0, 0], [1, 0, 0], [2, 0, 0], [3, 0, 0]])
+    assert union.triangles == [Triangle((0, 1, 2)), Triangle((1, 2, 3))]
+
+
+def test_unite_surfaces_function_streaming(tmpdir):
+    input_paths = []
+    for offset in range(3):
+        surface = Surface()
+        surface.creator = b"pytest"
+        surface.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+        for i in range(3):
+            surface.add_vertex(Vertex(i + offset, 0, 0))
+        surface.triangles.append(Triangle((0, 1, 2)))
+        input_paths.append(tmpdir.join(str(offset)).strpath)
+        surface.write_triangular(input_paths[-1])
+    output_path = tmpdir.join("output_path").strpath
+    with unittest.mock.patch("sys.argv", ["", "--output", output_path, *input_paths]):
+        unite_surfaces()
+    union = Surface.read_triangular(output_path)
+    assert len(union.vertices) == 9
+    assert union.triangles == [
+        Triangle((0, 1, 2)),
+        Triangle((3, 4, 5)),
+        Triangle((6, 7, 8)),
+    ]
+    assert union.creator == b"pytest"
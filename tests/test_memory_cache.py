@@ -0,0 +1,135 @@
+# freesurfer-surface - Read and Write Surface Files in Freesurfer’s TriangularSurface Format
+#
+# Copyright (C) 2020 Fabian Peter Hammerle <fabian@hammerle.me>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+import numpy
+import pytest
+
+from conftest import ANNOTATION_FILE_PATH, write_example_surface
+from freesurfer_surface import Annotation, Triangle, Vertex
+from freesurfer_surface.cache import MemoryCache
+
+# 4 vertices & 2 triangles
+_SURFACE_BYTES = 4 * 3 * 8 + 2 * 3 * 4
+
+
+def test_read_triangular(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    expected = write_example_surface(surface_path)
+    cache = MemoryCache(max_bytes=2**20)
+    surface_a = cache.read_triangular(surface_path)
+    surface_b = cache.read_triangular(surface_path)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+    assert cache.size_bytes == _SURFACE_BYTES
+    assert surface_a is not surface_b
+    for surface in [surface_a, surface_b]:
+        assert surface.vertices == expected.vertices
+        assert surface.triangles == expected.triangles
+        assert surface.creator == b"pytest"
+        assert surface.creation_datetime == expected.creation_datetime
+        assert surface.volume_geometry_info == expected.volume_geometry_info
+        assert surface.command_lines == [b"?", b"!"]
+    assert surface_a.vertex_coordinates.base is surface_b.vertex_coordinates.base
+    assert not surface_a.vertex_coordinates.flags.writeable
+    assert not surface_a.triangle_vertex_indices.flags.writeable
+    with pytest.raises(ValueError, match=r"read-only"):
+        surface_a.vertex_coordinates[0, 0] = 42
+    surface_a.vertices[0] = Vertex(-1.0, -1.0, -1.0)
+    surface_a.triangles.append(Triangle((1, 2, 3)))
+    surface_a.command_lines.append(b"modified")
+    surface_c = cache.read_triangular(surface_path)
+    assert surface_c.vertices == expected.vertices
+    assert surface_c.triangles == expected.triangles
+    assert surface_c.command_lines == [b"?", b"!"]
+    assert surface_b.vertices == expected.vertices
+
+
+def test_read_triangular_modified(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    write_example_surface(surface_path)
+    cache = MemoryCache(max_bytes=2**20)
+    cache.read_triangular(surface_path)
+    mtime_ns = os.stat(surface_path).st_mtime_ns
+    expected = write_example_surface(
+        surface_path, vertices=[Vertex(i + 1.0, i * 2, i * 3) for i in range(4)]
+    )
+    os.utime(surface_path, ns=(mtime_ns + 1, mtime_ns + 1))
+    assert cache.read_triangular(surface_path).vertices == expected.vertices
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(cache) == 1
+    assert cache.size_bytes == _SURFACE_BYTES
+
+
+def test_read_triangular_evict(tmpdir):
+    surface_paths = [tmpdir.join(f"{i}.pial").strpath for i in range(3)]
+    for surface_path in surface_paths:
+        write_example_surface(surface_path)
+    cache = MemoryCache(max_bytes=_SURFACE_BYTES * 2)
+    cache.read_triangular(surface_paths[0])
+    cache.read_triangular(surface_paths[1])
+    cache.read_triangular(surface_paths[0])
+    cache.read_triangular(surface_paths[2])  # evicts least recently used #1
+    assert len(cache) == 2
+    assert cache.size_bytes == _SURFACE_BYTES * 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.read_triangular(surface_paths[0])
+    cache.read_triangular(surface_paths[2])
+    assert (cache.hits, cache.misses) == (3, 3)
+    cache.read_triangular(surface_paths[1])
+    assert (cache.hits, cache.misses) == (3, 4)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+def test_read_triangular_exceeding_max_bytes(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    expected = write_example_surface(surface_path)
+    cache = MemoryCache(max_bytes=_SURFACE_BYTES - 1)
+    for _ in range(2):
+        assert cache.read_triangular(surface_path).vertices == expected.vertices
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(cache) == 0
+
+
+def test_read_triangular_missing(tmpdir):
+    with pytest.raises(FileNotFoundError):
+        MemoryCache(max_bytes=2**20).read_triangular(tmpdir.join("missing").strpath)
+
+
+def test_read_annotation():
+    expected = Annotation.read(ANNOTATION_FILE_PATH)
+    cache = MemoryCache(max_bytes=2**30)
+    annotation_a = cache.read_annotation(ANNOTATION_FILE_PATH)
+    annotation_b = cache.read_annotation(ANNOTATION_FILE_PATH)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.size_bytes == expected.vertex_label_indices.nbytes
+    for annotation in [annotation_a, annotation_b]:
+        assert numpy.array_equal(
+            annotation.vertex_label_indices, expected.vertex_label_indices
+        )
+        assert annotation.labels == expected.labels
+        assert annotation.colortable_path == expected.colortable_path
+    assert not annotation_a.vertex_label_indices.flags.writeable
+    annotation_a.vertex_label_index[0] = 21
+    annotation_a.labels[0].name = "modified"
+    annotation_c = cache.read_annotation(ANNOTATION_FILE_PATH)
+    assert annotation_c.vertex_label_index[0] == expected.vertex_label_index[0]
+    assert annotation_c.labels == expected.labels
+    assert annotation_b.labels[0].name == expected.labels[0].name
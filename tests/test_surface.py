@@ -15,21 +15,37 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# pylint: disable=too-many-lines
+
+import asyncio
+import collections
+import concurrent.futures
 import copy
 import datetime
+import struct
+import types
+import typing
 import unittest.mock
 
 import numpy
 import pytest
 
-from conftest import ANNOTATION_FILE_PATH, SURFACE_FILE_PATH
+from conftest import ANNOTATION_FILE_PATH, SURFACE_FILE_PATH, write_example_surface
+import freesurfer_surface
 from freesurfer_surface import (
     Annotation,
+    EdgeTable,
+    KDTree,
+    Label,
+    LabelStatistics,
     LineSegment,
+    PolygonalChain,
     PolygonalCircuit,
     Surface,
     Triangle,
+    TriangularSurfaceHeader,
     Vertex,
+    VertexAdjacency,
     setlocale,
 )
 
@@ -139,6 +155,36 @@ def test_write_triangular_empty(tmpdir):
         )
 
 
+def test_write_triangular_blocks(tmpdir):
+    surface = Surface()
+    surface.vertices = [Vertex(1.0, -2.0, 0.5), Vertex(0.0, 0.0, 1e-3)]
+    surface.add_vertex(Vertex(4.0, 5.0, 6.0))
+    surface.triangles = [Triangle((0, 1, 2)), Triangle((2, 1, 0))]
+    surface.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+    output_path = tmpdir.join("surface").strpath
+    surface.write_triangular(output_path)
+    with open(output_path, "rb") as output_file:
+        content = output_file.read()
+    blocks = content.split(b"\n\n", 1)[1][: 4 * 2 + 4 * 3 * 3 + 4 * 3 * 2]
+    assert blocks == (
+        struct.pack(">II", 3, 2)
+        + struct.pack(">fff", 1.0, -2.0, 0.5)
+        + struct.pack(">fff", 0.0, 0.0, 1e-3)
+        + struct.pack(">fff", 4.0, 5.0, 6.0)
+        + struct.pack(">III", 0, 1, 2)
+        + struct.pack(">III", 2, 1, 0)
+    )
+
+
+def test_write_triangular_invalid_vertex_index(tmpdir):
+    surface = Surface()
+    surface.vertices = [Vertex(0.0, 0.0, 0.0), Vertex(1.0, 1.0, 1.0)]
+    surface.triangles = [Triangle((0, 1, 2))]
+    surface.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+    with pytest.raises(AssertionError):
+        surface.write_triangular(tmpdir.join("surface").strpath)
+
+
 def test_read_write_triangular_same(tmpdir):
     surface = Surface.read_triangular(SURFACE_FILE_PATH)
     output_path = tmpdir.join("surface").strpath
@@ -190,6 +236,256 @@ def test_write_read_triangular_same(tmpdir):
     assert vars(expected_surface) == vars(resulted_surface)
 
 
+@pytest.mark.parametrize("mmap", [True, False])
+def test_open_triangular(tmpdir, mmap):
+    surface_file_path = tmpdir.join("surface").strpath
+    expected_surface = write_example_surface(surface_file_path)
+    surface = Surface.open_triangular(surface_file_path, mmap=mmap)
+    assert isinstance(surface.vertex_coordinates, numpy.memmap) == mmap
+    assert isinstance(surface.triangle_vertex_indices, numpy.memmap) == mmap
+    assert numpy.array_equal(
+        surface.vertex_coordinates, expected_surface.vertex_coordinates
+    )
+    assert surface.triangles == expected_surface.triangles
+    assert surface.vertices[0].dtype == numpy.float64
+    assert surface.creator == b"pytest"
+    assert surface.creation_datetime == expected_surface.creation_datetime
+    assert surface.using_old_real_ras
+    assert surface.volume_geometry_info == expected_surface.volume_geometry_info
+    assert surface.command_lines == [b"?", b"!"]
+
+
+def test_read_triangular_header(tmpdir):
+    surface_file_path = tmpdir.join("surface").strpath
+    expected_surface = write_example_surface(surface_file_path)
+    header = Surface.read_triangular_header(surface_file_path)
+    assert isinstance(header, TriangularSurfaceHeader)
+    assert header.creator == b"pytest"
+    assert header.creation_datetime == expected_surface.creation_datetime
+    assert header.vertices_num == 4
+    assert header.triangles_num == 2
+    assert header.using_old_real_ras
+    assert header.volume_geometry_info == expected_surface.volume_geometry_info
+    assert header.command_lines == (b"?", b"!")
+
+
+def test_read_triangular_header_truncated(tmpdir):
+    surface_file_path = tmpdir.join("surface").strpath
+    write_example_surface(surface_file_path)
+    with open(surface_file_path, "rb") as surface_file:
+        data = surface_file.read()
+    with open(surface_file_path, "wb") as surface_file:
+        surface_file.write(data[:-100])
+    with pytest.raises(AssertionError):
+        Surface.read_triangular_header(surface_file_path)
+
+
+@pytest.mark.parametrize("workers", [None, 1, 2])
+def test_read_triangular_many(tmpdir, workers):
+    surface_a_path = tmpdir.join("a").strpath
+    surface_a = write_example_surface(surface_a_path)
+    surface_b_path = tmpdir.join("b").strpath
+    Surface.unite([surface_a, Surface()]).write_triangular(surface_b_path)
+    surface_c_path = tmpdir.join("c").strpath
+    surface_c = Surface()
+    surface_c.creator = b"c"
+    surface_c.volume_geometry_info = surface_a.volume_geometry_info
+    surface_c.write_triangular(surface_c_path)
+    surfaces = Surface.read_triangular_many(
+        [surface_a_path, surface_c_path, surface_b_path, surface_a_path],
+        workers=workers,
+    )
+    assert len(surfaces) == 4
+    for surface in [surfaces[0], surfaces[2], surfaces[3]]:
+        assert numpy.array_equal(
+            surface.vertex_coordinates, surface_a.vertex_coordinates
+        )
+        assert surface.triangles == surface_a.triangles
+        assert surface.command_lines == [b"?", b"!"]
+    assert surfaces[0].creation_datetime == surface_a.creation_datetime
+    assert surfaces[1].creator == b"c"
+    assert not surfaces[1].vertices
+    assert not surfaces[1].triangles
+    surfaces[0].vertices[0] = Vertex(-1, -1, -1)
+    surfaces[0].triangles.append(Triangle((0, 1, 2)))
+    assert surfaces[3].vertices[0] == pytest.approx(Vertex(0, 0, 0))
+    assert len(surfaces[3].triangles) == 2
+
+
+def test_read_triangular_async(tmpdir):
+    surface_path = tmpdir.join("a").strpath
+    expected = write_example_surface(surface_path)
+
+    async def read_all():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            return await asyncio.gather(
+                *(
+                    Surface.read_triangular_async(surface_path, executor=executor)
+                    for _ in range(4)
+                ),
+                Surface.read_triangular_async(surface_path),
+            )
+
+    surfaces = asyncio.run(read_all())
+    assert len(surfaces) == 5
+    for surface in surfaces:
+        assert surface.vertices == expected.vertices
+        assert surface.triangles == expected.triangles
+        assert surface.creation_datetime == expected.creation_datetime
+
+
+def test_read_triangular_async_missing(tmpdir):
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(Surface.read_triangular_async(tmpdir.join("missing").strpath))
+
+
+def test_read_triangular_many_missing(tmpdir):
+    surface_path = tmpdir.join("a").strpath
+    write_example_surface(surface_path)
+    with pytest.raises(FileNotFoundError):
+        Surface.read_triangular_many([surface_path, tmpdir.join("missing").strpath])
+
+
+class _FakeSharedMemory:
+    """
+    in-process stand-in for `multiprocessing.shared_memory.SharedMemory`
+    (python<3.8)
+    """
+
+    _buffers: typing.Dict[str, bytearray] = {}
+
+    def __init__(self, name=None, create=False, size=0):
+        if create:
+            name = f"fake{len(self._buffers)}"
+            self._buffers[name] = bytearray(size)
+        elif name not in self._buffers:
+            raise FileNotFoundError(name)
+        self.name = self._name = name
+        self.buf = memoryview(self._buffers[name])
+
+    def close(self):
+        self.buf.release()
+
+    def unlink(self):
+        del self._buffers[self.name]
+
+
+@pytest.fixture(name="shared_memory")
+def _shared_memory_fixture(monkeypatch):
+    if freesurfer_surface.shared_memory is not None:
+        return freesurfer_surface.shared_memory
+    shared_memory = types.SimpleNamespace(SharedMemory=_FakeSharedMemory)
+    monkeypatch.setattr(freesurfer_surface, "shared_memory", shared_memory)
+    monkeypatch.setattr(
+        freesurfer_surface, "resource_tracker", unittest.mock.Mock(), raising=False
+    )
+    return shared_memory
+
+
+def test_read_triangular_to_shared_memory(tmpdir, shared_memory):
+    surface_path = tmpdir.join("a").strpath
+    expected = write_example_surface(surface_path)
+    (
+        surface,
+        memory_name,
+        vertices_num,
+        triangles_num,
+    ) = Surface._read_triangular_to_shared_memory(surface_path)
+    assert not surface.vertices
+    assert not surface.triangles
+    assert surface.command_lines == expected.command_lines
+    assert (vertices_num, triangles_num) == (4, 2)
+    surface._load_shared_memory(memory_name, vertices_num, triangles_num)
+    assert numpy.array_equal(surface.vertex_coordinates, expected.vertex_coordinates)
+    assert surface.triangles == expected.triangles
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=memory_name)
+    _, memory_name, _, _ = Surface._read_triangular_to_shared_memory(surface_path)
+    Surface._unlink_shared_memory(memory_name)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=memory_name)
+
+
+def test_read_triangular_to_shared_memory_fill_failure(
+    tmpdir, shared_memory, monkeypatch
+):
+    surface_path = tmpdir.join("a").strpath
+    write_example_surface(surface_path)
+    memory_names = []
+
+    def create_shared_memory_mock(create, size):
+        assert create and size > 1
+        memory = shared_memory.SharedMemory(create=True, size=1)
+        memory_names.append(memory.name)
+        return memory
+
+    monkeypatch.setattr(
+        freesurfer_surface,
+        "shared_memory",
+        types.SimpleNamespace(SharedMemory=create_shared_memory_mock),
+    )
+    with pytest.raises(TypeError, match=r"buffer is too small"):
+        Surface._read_triangular_to_shared_memory(surface_path)
+    assert len(memory_names) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=memory_names[0])
+
+
+def test_read_triangular_many_load_failure(tmpdir, monkeypatch):
+    surface_path = tmpdir.join("a").strpath
+    write_example_surface(surface_path)
+    unlink_shared_memory = Surface._unlink_shared_memory
+    unlinked_memory_names = []
+
+    def unlink_shared_memory_mock(memory_name):
+        unlink_shared_memory(memory_name)
+        unlinked_memory_names.append(memory_name)
+
+    def load_shared_memory_mock(_surface, memory_name, *_args):
+        unlink_shared_memory_mock(memory_name)
+        raise MemoryError()
+
+    monkeypatch.setattr(Surface, "_load_shared_memory", load_shared_memory_mock)
+    monkeypatch.setattr(
+        Surface, "_unlink_shared_memory", staticmethod(unlink_shared_memory_mock)
+    )
+    with pytest.raises(MemoryError):
+        Surface.read_triangular_many([surface_path] * 8, workers=1)
+    # first file failed to load, next one was already queued for the worker
+    assert len(unlinked_memory_names) >= 2
+    if freesurfer_surface.shared_memory is not None:
+        for memory_name in unlinked_memory_names:
+            with pytest.raises(FileNotFoundError):
+                freesurfer_surface.shared_memory.SharedMemory(name=memory_name)
+
+
+def test_open_triangular_copy_on_write(tmpdir):
+    surface_file_path = tmpdir.join("surface").strpath
+    write_example_surface(surface_file_path)
+    surface = Surface.open_triangular(surface_file_path)
+    assert surface.vertex_coordinates.dtype == numpy.dtype(">f4")
+    assert not surface.vertex_coordinates.flags.writeable
+    surface.vertices[1] = Vertex(-1.0, -2.0, -3.0)
+    surface.triangles.append(Triangle((1, 2, 3)))
+    assert surface.vertex_coordinates[1].tolist() == [-1.0, -2.0, -3.0]
+    assert len(surface.triangles) == 3
+    reopened_surface = Surface.open_triangular(surface_file_path)
+    assert reopened_surface.vertex_coordinates[1].tolist() == [1.0, 2.0, 3.0]
+    assert len(reopened_surface.triangles) == 2
+
+
+def test_open_triangular_empty(tmpdir):
+    surface = Surface()
+    surface.creator = b"pytest"
+    surface.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+    surface_file_path = tmpdir.join("surface").strpath
+    surface.write_triangular(surface_file_path)
+    opened_surface = Surface.open_triangular(surface_file_path)
+    assert not opened_surface.vertices
+    assert not opened_surface.triangles
+    assert opened_surface.volume_geometry_info == surface.volume_geometry_info
+
+
 def test_write_triangular_same_locale(tmpdir):
     surface = Surface()
     surface.creator = b"pytest"
@@ -345,6 +641,163 @@ def test__triangle_count_by_adjacent_vertex_indices_real():
     )
 
 
+def test_adjacency_matrix():
+    surface = Surface()
+    for i in range(5):
+        surface.add_vertex(Vertex(i, 0, 0))
+    surface.triangles.append(Triangle((0, 1, 2)))
+    surface.triangles.append(Triangle((3, 1, 2)))
+    adjacency = surface.adjacency_matrix()
+    assert isinstance(adjacency, VertexAdjacency)
+    assert adjacency.indptr.tolist() == [0, 2, 5, 8, 10, 10]
+    assert adjacency.indices.tolist() == [1, 2, 0, 2, 3, 0, 1, 3, 1, 2]
+    assert adjacency.triangle_counts.tolist() == [1, 1, 1, 2, 1, 1, 2, 1, 1, 1]
+    assert surface.vertex_neighbours(2).tolist() == [0, 1, 3]
+    assert not surface.vertex_neighbours(4).size
+    assert adjacency.neighbour_triangle_counts(1).tolist() == [1, 2, 1]
+
+
+def test_adjacency_matrix_empty():
+    adjacency = Surface().adjacency_matrix()
+    assert adjacency.indptr.tolist() == [0]
+    assert not adjacency.indices.size
+
+
+def test_adjacency_matrix_cached():
+    surface = Surface()
+    for i in range(4):
+        surface.add_vertex(Vertex(i, 0, 0))
+    surface.triangles.append(Triangle((0, 1, 2)))
+    adjacency = surface.adjacency_matrix()
+    assert surface.adjacency_matrix() is adjacency
+    surface.triangles.append(Triangle((1, 2, 3)))
+    assert surface.vertex_neighbours(3).tolist() == [1, 2]
+    adjacency = surface.adjacency_matrix()
+    surface.add_vertex(Vertex(0, 1, 0))
+    assert len(surface.adjacency_matrix().indptr) == 6
+    adjacency = surface.adjacency_matrix()
+    del surface.triangles[0]
+    assert surface.adjacency_matrix() is not adjacency
+    assert not surface.vertex_neighbours(0).size
+    surface.triangles = [Triangle((0, 3, 4))]
+    assert surface.vertex_neighbours(0).tolist() == [3, 4]
+
+
+def test_edge_table():
+    surface = Surface()
+    for i in range(6):
+        surface.add_vertex(Vertex(i, 0, 0))
+    surface.triangles.append(Triangle((0, 1, 2)))
+    surface.triangles.append(Triangle((3, 1, 2)))
+    surface.triangles.append(Triangle((2, 1, 4)))
+    edge_table = surface.edge_table()
+    assert isinstance(edge_table, EdgeTable)
+    assert edge_table.vertex_indices.tolist() == [
+        [0, 1],
+        [0, 2],
+        [1, 2],
+        [1, 3],
+        [1, 4],
+        [2, 3],
+        [2, 4],
+    ]
+    assert edge_table.triangle_edge_indices.tolist() == [
+        [0, 2, 1],
+        [3, 2, 5],
+        [2, 4, 6],
+    ]
+    assert edge_table.triangle_counts.tolist() == [1, 1, 3, 1, 1, 1, 1]
+    assert edge_table.edge_triangle_indices.tolist() == [
+        [0, -1],
+        [0, -1],
+        [0, 1],
+        [1, -1],
+        [2, -1],
+        [1, -1],
+        [2, -1],
+    ]
+    assert edge_table.boundary_mask.tolist() == [1, 1, 0, 1, 1, 1, 1]
+    assert edge_table.non_manifold_mask.tolist() == [0, 0, 1, 0, 0, 0, 0]
+
+
+def test_edge_table_empty():
+    edge_table = Surface().edge_table()
+    assert edge_table.vertex_indices.shape == (0, 2)
+    assert edge_table.triangle_edge_indices.shape == (0, 3)
+    assert edge_table.edge_triangle_indices.shape == (0, 2)
+    assert not edge_table.boundary_mask.any()
+
+
+def test_edge_table_cached():
+    surface = Surface()
+    for i in range(4):
+        surface.add_vertex(Vertex(i, 0, 0))
+    surface.triangles.append(Triangle((0, 1, 2)))
+    edge_table = surface.edge_table()
+    assert surface.edge_table() is edge_table
+    surface.triangles.append(Triangle((1, 2, 3)))
+    edge_table = surface.edge_table()
+    assert edge_table.triangle_counts.tolist() == [1, 1, 2, 1, 1]
+    assert edge_table.edge_triangle_indices[2].tolist() == [0, 1]
+
+
+def test_versions():
+    surface = Surface()
+    versions = [(surface.geometry_version, surface.topology_version)]
+    vertex_index = surface.add_vertex(Vertex(0, 0, 0))
+    versions.append((surface.geometry_version, surface.topology_version))
+    surface.add_rectangle((vertex_index, surface.add_vertex(Vertex(1, 0, 0)), 1))
+    versions.append((surface.geometry_version, surface.topology_version))
+    surface.vertices[1] = Vertex(2, 0, 0)
+    versions.append((surface.geometry_version, surface.topology_version))
+    surface.remove_unused_vertices()
+    versions.append((surface.geometry_version, surface.topology_version))
+    surface.triangles = []
+    versions.append((surface.geometry_version, surface.topology_version))
+    geometry_versions, topology_versions = zip(*versions)
+    assert list(geometry_versions) == sorted(geometry_versions)
+    assert list(topology_versions) == sorted(topology_versions)
+    assert [
+        (geometry_b > geometry_a, topology_b > topology_a)
+        for (geometry_a, topology_a), (geometry_b, topology_b) in zip(
+            versions, versions[1:]
+        )
+    ] == [(True, False), (True, True), (True, False), (False, False), (False, True)]
+
+
+def test_invalidate_derived_data():
+    surface = _grid_surface(3)
+    edge_table = surface.edge_table()
+    adjacency = surface.adjacency_matrix()
+    geometry_version = surface.geometry_version
+    topology_version = surface.topology_version
+    surface.vertex_coordinates[0] = (-1.0, -1.0, -1.0)
+    surface.invalidate_derived_data(topology=False)
+    assert surface.geometry_version > geometry_version
+    assert surface.topology_version == topology_version
+    assert surface.edge_table() is edge_table
+    triangle_vertex_indices = surface.triangle_vertex_indices
+    triangle_vertex_indices[0] = triangle_vertex_indices[0, ::-1]
+    surface.invalidate_derived_data(geometry=False)
+    assert surface.topology_version > topology_version
+    assert "edge_table" not in surface._derived_data
+    assert surface.edge_table() is not edge_table
+    assert surface.adjacency_matrix() is not adjacency
+    surface.invalidate_derived_data()
+    assert not surface._derived_data
+
+
+def test_invalidate_derived_data_version_collision():
+    surface = _grid_surface(3)
+    # outdated geometry version (vertices, triangles) = (9, 9)
+    # equals current topology version (triangles, number of vertices)
+    surface._vertices.version = surface._triangles.version = len(surface.vertices)
+    surface.adjacency_edge_lengths_mm()
+    surface.edge_table()
+    surface.invalidate_derived_data(topology=False)
+    assert set(surface._derived_data) == {"adjacency_matrix", "edge_table"}
+
+
 def test_find_borders_none():
     surface = Surface.read_triangular(SURFACE_FILE_PATH)
     assert not list(surface.find_borders())
@@ -425,6 +878,61 @@ def test_find_borders_remove_adjacent_triangles():
     assert PolygonalCircuit((137076, 136141, 135263, 135264, 136142)) in borders
 
 
+def _grid_surface(size: int) -> Surface:
+    surface = Surface()
+    for row in range(size):
+        for column in range(size):
+            surface.add_vertex(Vertex(row, column, 0))
+    for row in range(size - 1):
+        for column in range(size - 1):
+            corner = row * size + column
+            surface.triangles.append(Triangle((corner, corner + 1, corner + size)))
+            surface.triangles.append(
+                Triangle((corner + 1, corner + size + 1, corner + size))
+            )
+    return surface
+
+
+def test_find_borders_grid_holes():
+    surface = _grid_surface(8)
+    surface.add_vertex(Vertex(0, 0, 1))
+    # remove both triangles of squares (1, 1) & (4, 5)
+    surface.triangles = [
+        t
+        for i, t in enumerate(surface.triangles)
+        if i // 2 not in (1 * 7 + 1, 4 * 7 + 5)
+    ]
+    borders = list(surface.find_borders())
+    assert borders[0] == PolygonalCircuit((64,))
+    assert set(borders[1:]) == {
+        PolygonalCircuit(
+            [*range(0, 8), *range(15, 64, 8), *range(62, 55, -1), *range(48, 7, -8)]
+        ),
+        PolygonalCircuit((9, 10, 18, 17)),
+        PolygonalCircuit((37, 38, 46, 45)),
+    }
+
+
+def test_find_borders_pinch():
+    surface = _grid_surface(5)
+    # squares (1, 1) & (2, 2) share vertex 12 only
+    surface.triangles = [
+        t
+        for i, t in enumerate(surface.triangles)
+        if i // 2 not in (1 * 4 + 1, 2 * 4 + 2)
+    ]
+    borders = list(surface.find_borders())
+    assert sum(len(b.vertex_indices) for b in borders) == 16 + 4 + 4
+    assert sorted(
+        sorted(e) for b in borders for e in b.adjacent_vertex_indices(2)
+    ) == sorted(
+        [[i, i + 1] for i in (0, 1, 2, 3, 20, 21, 22, 23)]
+        + [[i, i + 5] for i in (0, 5, 10, 15, 4, 9, 14, 19)]
+        + [[6, 7], [6, 11], [7, 12], [11, 12]]
+        + [[12, 13], [12, 17], [13, 18], [17, 18]]
+    )
+
+
 @pytest.mark.parametrize(
     ("label_name", "expected_border_lens"),
     [
@@ -531,6 +1039,28 @@ def test__find_label_border_segments_incomplete_annotation():
     assert len(border_segments) == 417
 
 
+def test__find_label_border_segments_synthetic():
+    surface = Surface()
+    for i in range(5):
+        surface.add_vertex(Vertex(i, 0, 0))
+    surface.triangles.append(Triangle((0, 1, 2)))
+    surface.triangles.append(Triangle((1, 3, 2)))
+    surface.triangles.append(Triangle((2, 3, 4)))
+    surface.annotation = Annotation()
+    label = Label(index=1, name="label", red=255, green=0, blue=0, transparency=0)
+    surface.annotation.labels[label.index] = label
+    surface.annotation.vertex_label_indices = numpy.array([-1, 1, 1, 1])
+    # pylint: disable=protected-access
+    assert set(surface._find_label_border_segments(label)) == {
+        LineSegment((1, 2)),
+        LineSegment((2, 3)),
+    }
+    surface.annotation.vertex_label_indices = numpy.array([1, 1, -1, 0, 1])
+    assert set(surface._find_label_border_segments(label)) == {
+        LineSegment((0, 1)),
+    }
+
+
 def test_find_label_border_polygonal_chains_missing_annotation():
     surface = Surface.read_triangular(SURFACE_FILE_PATH)
     annotation = Annotation.read(ANNOTATION_FILE_PATH)
@@ -581,6 +1111,110 @@ def test_find_label_border_polygonal_chains_long_leaf():
     assert list(border_chain.normalized().vertex_indices) == [0, 1, 2, 4, 5, 4, 2, 3]
 
 
+@pytest.mark.parametrize("leaf_length", [1, 2, 3, 4, 5000])
+@pytest.mark.parametrize("junction_index", [0, 1])
+def test__link_polygonal_chains_leaf(leaf_length, junction_index):
+    segments = [LineSegment((i, (i + 1) % 4)) for i in range(4)]
+    leaf_indices = [junction_index] + list(range(10, 10 + leaf_length))
+    segments.extend(map(LineSegment, zip(leaf_indices, leaf_indices[1:])))
+    # pylint: disable=protected-access
+    (chain,) = Surface._link_polygonal_chains(segments)
+    cycle_indices = [0, 1, 2, 3]
+    cycle_indices[junction_index + 1 : junction_index + 1] = (
+        leaf_indices[1:] + leaf_indices[-2::-1]
+    )
+    assert chain == PolygonalChain(cycle_indices)
+
+
+def test__link_polygonal_chains_tree():
+    segments = [LineSegment((i, (i + 1) % 3)) for i in range(3)]
+    segments.extend(
+        map(LineSegment, [(1, 10), (10, 11), (10, 12), (12, 13), (12, 14), (1, 20)])
+    )
+    # pylint: disable=protected-access
+    (chain,) = Surface._link_polygonal_chains(segments)
+    vertex_indices = list(chain.vertex_indices)
+    assert len(vertex_indices) == 3 + 2 * 6
+    edges = collections.Counter(
+        frozenset(pair)
+        for pair in zip(vertex_indices, vertex_indices[1:] + vertex_indices[:1])
+    )
+    assert edges == collections.Counter(
+        {
+            frozenset(s.vertex_indices): 1 if max(s.vertex_indices) < 3 else 2
+            for s in segments
+        }
+    )
+
+
+def test__link_polygonal_chains_without_cycle():
+    segments = list(map(LineSegment, [(0, 1), (1, 2), (1, 3), (5, 6)]))
+    # pylint: disable=protected-access
+    chains = list(Surface._link_polygonal_chains(segments))
+    assert len(chains) == 2
+    assert PolygonalChain((5, 6)) in chains
+    (tree_chain,) = filter(lambda c: len(c.vertex_indices) == 6, chains)
+    assert sorted(tree_chain.vertex_indices) == [0, 1, 1, 1, 2, 3]
+
+
+def test__link_polygonal_chains_touching_cycles():
+    segments = [LineSegment((i, (i + 1) % 3)) for i in range(3)]
+    segments.extend(map(LineSegment, [(0, 3), (3, 4), (4, 0)]))
+    # pylint: disable=protected-access
+    chains = list(Surface._link_polygonal_chains(segments))
+    assert sorted(len(c.vertex_indices) for c in chains) in ([3, 3], [6])
+
+
+def test_find_all_label_border_polygonal_chains():
+    surface = _grid_surface(6)
+    surface.annotation = Annotation()
+    for index, name in enumerate(["outer", "inner", "empty"]):
+        surface.annotation.labels[index] = Label(
+            index=index, name=name, red=index, green=0, blue=0, transparency=0
+        )
+    vertex_label_indices = numpy.zeros(36, dtype=numpy.int32)
+    vertex_label_indices[[14, 15, 20, 21]] = 1
+    vertex_label_indices[8] = Annotation.UNLABELLED_INDEX
+    surface.annotation.vertex_label_indices = vertex_label_indices
+    chains = surface.find_all_label_border_polygonal_chains()
+    assert set(chains.keys()) == {0, 1, 2}
+    (inner_chain,) = chains[1]
+    assert inner_chain.normalized() == PolygonalChain((14, 15, 21, 20))
+    # around labels 1 & unlabelled vertex 8
+    (outer_chain,) = chains[0]
+    assert outer_chain.normalized() == PolygonalChain(
+        (2, 3, 9, 10, 16, 22, 27, 26, 25, 19, 13, 7)
+    )
+    assert not chains[2]
+    for label in surface.annotation.labels.values():
+        assert [c.normalized() for c in chains[label.index]] == [
+            c.normalized() for c in surface.find_label_border_polygonal_chains(label)
+        ]
+
+
+def test_find_all_label_border_polygonal_chains_missing_annotation():
+    with pytest.raises(RuntimeError, match=r"\bload_annotation_file\b"):
+        Surface().find_all_label_border_polygonal_chains()
+
+
+def test_find_all_label_border_polygonal_chains_real():
+    surface = Surface.read_triangular(SURFACE_FILE_PATH)
+    surface.load_annotation_file(ANNOTATION_FILE_PATH)
+    chains = surface.find_all_label_border_polygonal_chains()
+    assert set(chains.keys()) == set(surface.annotation.labels.keys())
+    (precentral_label,) = filter(
+        lambda l: l.name == "precentral", surface.annotation.labels.values()
+    )
+    (border_chain,) = chains[precentral_label.index]
+    assert (
+        border_chain.normalized()
+        == next(
+            surface.find_label_border_polygonal_chains(precentral_label)
+        ).normalized()
+    )
+    assert len(border_chain.vertex_indices) == 418
+
+
 def test__unused_vertices():
     surface = Surface()
     assert not surface._unused_vertices()
@@ -658,6 +1292,33 @@ def test_remove_unused_vertices_some():
     assert len(surface.triangles) == 4
 
 
+def test_remove_unused_vertices_index_conversion():
+    surface = Surface()
+    for i in range(6):
+        surface.add_vertex(Vertex(i, i, i))
+    surface.triangles.append(Triangle((1, 4, 2)))
+    surface.triangles.append(Triangle((4, 5, 2)))
+    vertex_index_conversion = surface.remove_unused_vertices()
+    assert vertex_index_conversion.tolist() == [-1, 0, 1, -1, 2, 3]
+    overlay = numpy.arange(6) * 10
+    assert overlay[vertex_index_conversion >= 0].tolist() == [10, 20, 40, 50]
+    assert surface.triangle_vertex_indices.tolist() == [[0, 2, 1], [2, 3, 1]]
+    assert surface.remove_unused_vertices().tolist() == [0, 1, 2, 3]
+
+
+def test_remove_unused_vertices_annotation():
+    surface = Surface()
+    for i in range(6):
+        surface.add_vertex(Vertex(i, i, i))
+    surface.triangles.append(Triangle((1, 4, 2)))
+    surface.triangles.append(Triangle((4, 5, 2)))
+    surface.annotation = Annotation()
+    surface.annotation.vertex_label_indices = numpy.array([3, 4, -1, 5, 6])
+    surface.remove_unused_vertices()
+    assert surface.annotation.vertex_label_indices.tolist() == [4, -1, 6, -1]
+    assert surface.annotation.vertex_label_index == {0: 4, 2: 6}
+
+
 def test_remove_unused_vertices_none():
     surface = Surface.read_triangular(SURFACE_FILE_PATH)
     assert len(surface.vertices) == 155622
@@ -704,6 +1365,389 @@ def test_select_vertices():
     )
 
 
+@pytest.mark.parametrize("max_block_bytes", [1, 64, 2**26])
+def test_distances_mm(max_block_bytes):
+    surface = _grid_surface(4)
+    sources = numpy.array([0, 5, 15])
+    targets = numpy.array([[0.0, 0.0, 0.0], [3.0, 4.0, 0.0], [1.0, 1.0, 1.0]])
+    expected = numpy.array(
+        [
+            [surface.vertices[s].distance_mm(t.reshape(1, 3))[0] for t in targets]
+            for s in sources
+        ]
+    )
+    distances = surface.distances_mm(sources, targets, max_block_bytes=max_block_bytes)
+    assert distances.dtype == numpy.float64
+    assert distances == pytest.approx(expected)
+    assert surface.distances_mm(
+        surface.vertex_coordinates[sources],
+        [3, 10, 12],
+        max_block_bytes=max_block_bytes,
+    ) == pytest.approx(
+        surface.distances_mm(sources, surface.vertex_coordinates[[3, 10, 12]])
+    )
+    distances = surface.distances_mm(
+        sources, targets, dtype=numpy.float32, max_block_bytes=max_block_bytes
+    )
+    assert distances.dtype == numpy.float32
+    assert distances == pytest.approx(expected, rel=1e-6)
+    min_distances, target_indices = surface.min_distances_mm(
+        numpy.arange(16), targets, max_block_bytes=max_block_bytes
+    )
+    all_distances = surface.distances_mm(numpy.arange(16), targets)
+    assert target_indices.tolist() == all_distances.argmin(axis=1).tolist()
+    assert min_distances == pytest.approx(all_distances.min(axis=1))
+
+
+def test_distances_mm_nearby():
+    surface = Surface()
+    surface.add_vertex(Vertex(100.0, 100.0, 100.0))
+    surface.add_vertex(Vertex(100.0, 100.0, 100.0 + 1e-9))
+    assert surface.distances_mm([0], [0, 1])[0].tolist() == pytest.approx(
+        [0, 1e-9], rel=1e-4, abs=1e-15
+    )
+
+
+def test_distances_mm_empty():
+    surface = _grid_surface(2)
+    assert surface.distances_mm([], [0, 1]).shape == (0, 2)
+    assert surface.distances_mm(numpy.arange(4), []).shape == (4, 0)
+    min_distances, target_indices = surface.min_distances_mm([], [0])
+    assert not min_distances.size
+    assert not target_indices.size
+    with pytest.raises(ValueError, match=r"^expected at least one target$"):
+        surface.min_distances_mm([0], [])
+
+
+def test_distances_mm_invalid():
+    surface = _grid_surface(2)
+    with pytest.raises(
+        ValueError, match=r"\(N, 3\) array of coordinates, got \(2, 2\)"
+    ):
+        surface.distances_mm([0], [[0.0, 0.0], [1.0, 1.0]])
+    with pytest.raises(ValueError, match=r"^expected floating point dtype"):
+        surface.distances_mm([0], [1], dtype=numpy.int32)
+
+
+def test_kd_tree_cached():
+    surface = _grid_surface(4)
+    kd_tree = surface.kd_tree()
+    assert isinstance(kd_tree, KDTree)
+    assert surface.kd_tree() is kd_tree
+    surface.triangles.append(Triangle((0, 1, 4)))
+    assert surface.kd_tree() is kd_tree
+    surface.add_vertex(Vertex(8.0, 8.0, 8.0))
+    assert surface.kd_tree() is not kd_tree
+    assert surface.nearest_vertices([[7.0, 7.0, 7.0]])[1].tolist() == [[16]]
+
+
+@pytest.mark.parametrize("vertices_num", [1, 15, 16, 17, 100, 2000])
+@pytest.mark.parametrize("k", [1, 3, 16])
+def test_nearest_vertices(vertices_num, k):
+    k = min(k, vertices_num)
+    random = numpy.random.default_rng(vertices_num)
+    surface = Surface()
+    surface.vertex_coordinates = random.normal(size=(vertices_num, 3))
+    points = numpy.concatenate(
+        (random.normal(size=(50, 3)) * 2, surface.vertex_coordinates[:10])
+    )
+    distances, vertex_indices = surface.nearest_vertices(points, k=k)
+    assert distances.shape == vertex_indices.shape == (len(points), k)
+    all_distances = surface.distances_mm(points, numpy.arange(vertices_num))
+    assert distances == pytest.approx(numpy.sort(all_distances, axis=1)[:, :k])
+    assert distances == pytest.approx(
+        numpy.take_along_axis(all_distances, vertex_indices, axis=1)
+    )
+    assert (distances[50:, 0] == 0).all()
+    _, vertex_indices = surface.nearest_vertices([vertices_num - 1, 0], k=k)
+    assert vertex_indices[:, 0].tolist() == [vertices_num - 1, 0]
+
+
+@pytest.mark.parametrize("vertices_num", [0, 1, 17, 2000])
+@pytest.mark.parametrize("radius", [0.0, 0.5, 2.0])
+def test_vertices_within_radius(vertices_num, radius):
+    random = numpy.random.default_rng(vertices_num)
+    surface = Surface()
+    surface.vertex_coordinates = random.normal(size=(vertices_num, 3))
+    points = random.normal(size=(40, 3))
+    indptr, vertex_indices, distances = surface.vertices_within_radius(points, radius)
+    assert indptr.shape == (len(points) + 1,)
+    all_distances = surface.distances_mm(points, numpy.arange(vertices_num))
+    for point_index, point_distances in enumerate(all_distances):
+        (expected_vertex_indices,) = numpy.nonzero(point_distances <= radius)
+        neighbours = slice(indptr[point_index], indptr[point_index + 1])
+        assert vertex_indices[neighbours].tolist() == expected_vertex_indices.tolist()
+        assert distances[neighbours] == pytest.approx(
+            point_distances[expected_vertex_indices]
+        )
+
+
+def test_nearest_vertices_invalid():
+    surface = _grid_surface(2)
+    distances, vertex_indices = surface.nearest_vertices(numpy.zeros((0, 3)), k=2)
+    assert distances.shape == vertex_indices.shape == (0, 2)
+    with pytest.raises(ValueError, match=r"^expected 1 <= k <= 4, got 5$"):
+        surface.nearest_vertices([[0.0, 0.0, 0.0]], k=5)
+    with pytest.raises(ValueError, match=r"^expected 1 <= k <= 4, got 0$"):
+        surface.nearest_vertices([[0.0, 0.0, 0.0]], k=0)
+    with pytest.raises(ValueError, match=r"^expected 1 <= k <= 0, got 1$"):
+        Surface().nearest_vertices([[0.0, 0.0, 0.0]])
+    with pytest.raises(
+        ValueError, match=r"\(N, 3\) array of coordinates, got \(1, 2\)"
+    ):
+        surface.vertices_within_radius([[0.0, 0.0]], 1.0)
+    indptr, vertex_indices, distances = surface.vertices_within_radius(
+        [[0.0, 0.0, 0.0]], -1.0
+    )
+    assert indptr.tolist() == [0, 0]
+    assert not vertex_indices.size
+    assert not distances.size
+
+
+def test_triangle_areas_normals():
+    surface = _grid_surface(4)
+    assert surface.triangle_areas_mm2() == pytest.approx([0.5] * 18)
+    assert surface.area_mm2() == pytest.approx(9)
+    assert numpy.allclose(surface.triangle_normals(), [[0, 0, -1]] * 18)
+    assert numpy.allclose(surface.vertex_normals(), [[0, 0, -1]] * 16)
+    vertex_areas = surface.vertex_areas_mm2()
+    assert vertex_areas.sum() == pytest.approx(9)
+    # corner vertices 0 & 15 are in one triangle, 3 & 12 in two, inner vertices in six
+    assert vertex_areas[[0, 3, 5, 12, 15]] == pytest.approx(
+        [1 / 6, 1 / 3, 1, 1 / 3, 1 / 6]
+    )
+    surface.vertices[15] = Vertex(3.0, 3.0, 1.0)
+    assert surface.area_mm2() == pytest.approx(8.5 + numpy.sqrt(3) / 2)
+    assert numpy.allclose(
+        surface.triangle_normals()[-1], numpy.array([1, 1, -1]) / numpy.sqrt(3)
+    )
+
+
+def test_triangle_areas_normals_random():
+    random = numpy.random.default_rng(0)
+    surface = Surface()
+    surface.vertex_coordinates = random.normal(size=(20, 3))
+    surface.triangle_vertex_indices = random.integers(0, 20, size=(50, 3))
+    surface.add_vertex(Vertex(0.0, 0.0, 0.0))
+    expected_normals = []
+    expected_areas = []
+    for triangle in surface.triangles:
+        corner_a, corner_b, corner_c = surface.select_vertices(triangle.vertex_indices)
+        cross_product = numpy.cross(corner_b - corner_a, corner_c - corner_a)
+        expected_areas.append(numpy.linalg.norm(cross_product) / 2)
+        expected_normals.append(
+            cross_product / numpy.linalg.norm(cross_product)
+            if expected_areas[-1] > 0
+            else cross_product
+        )
+    assert surface.triangle_areas_mm2() == pytest.approx(expected_areas)
+    assert numpy.allclose(surface.triangle_normals(), expected_normals)
+    vertex_normals = surface.vertex_normals()
+    for vertex_index in range(20):
+        triangle_mask = (surface.triangle_vertex_indices == vertex_index).sum(axis=1)
+        normal = (
+            numpy.array(expected_normals)
+            * (numpy.array(expected_areas) * triangle_mask)[:, numpy.newaxis]
+        ).sum(axis=0)
+        assert numpy.allclose(
+            vertex_normals[vertex_index], normal / numpy.linalg.norm(normal)
+        )
+        assert surface.vertex_areas_mm2()[vertex_index] == pytest.approx(
+            (numpy.array(expected_areas) * triangle_mask).sum() / 3
+        )
+    assert vertex_normals[20].tolist() == [0, 0, 0]
+    assert surface.vertex_areas_mm2()[20] == 0
+
+
+def test_label_areas_mm2():
+    surface = _grid_surface(4)
+    surface.annotation = Annotation()
+    for index, name in enumerate(["a", "b", "empty"]):
+        surface.annotation.labels[index] = Label(
+            index=index, name=name, red=index, green=0, blue=0, transparency=0
+        )
+    surface.annotation.vertex_label_indices = numpy.array(
+        [0, 0, 1, 1, 0, 0, 1, -1, 0, 0, 1, 1], dtype=numpy.int32
+    )
+    vertex_areas = surface.vertex_areas_mm2()
+    label_areas = surface.label_areas_mm2()
+    assert list(label_areas.keys()) == [0, 1, 2]
+    assert label_areas[0] == pytest.approx(vertex_areas[[0, 1, 4, 5, 8, 9]].sum())
+    assert label_areas[1] == pytest.approx(vertex_areas[[2, 3, 6, 10, 11]].sum())
+    assert label_areas[2] == 0
+    with pytest.raises(RuntimeError, match=r"\bload_annotation_file\b"):
+        Surface().label_areas_mm2()
+
+
+def test_label_statistics():
+    surface = _grid_surface(4)
+    vertex_label_indices = numpy.array([0, 0, 2, 2] * 3 + [-1] * 4)
+    overlay = numpy.arange(16, dtype=float) ** 2
+    statistics = surface.label_statistics(vertex_label_indices, overlay=overlay)
+    assert isinstance(statistics, LabelStatistics)
+    assert statistics.vertex_counts.tolist() == [6, 0, 6]
+    vertex_areas = surface.vertex_areas_mm2()
+    assert statistics.areas_mm2 == pytest.approx(
+        [
+            vertex_areas[[0, 1, 4, 5, 8, 9]].sum(),
+            0,
+            vertex_areas[[2, 3, 6, 7, 10, 11]].sum(),
+        ]
+    )
+    assert statistics.centroids[[0, 2]] == pytest.approx(
+        numpy.array([[1, 0.5, 0], [1, 2.5, 0]])
+    )
+    assert numpy.isnan(statistics.centroids[1]).all()
+    assert statistics.bounding_box_mins[[0, 2]].tolist() == [[0, 0, 0], [0, 2, 0]]
+    assert statistics.bounding_box_maxs[[0, 2]].tolist() == [[2, 1, 0], [2, 3, 0]]
+    for label_index in (0, 2):
+        values = overlay[vertex_label_indices == label_index]
+        assert statistics.overlay_means[label_index] == pytest.approx(values.mean())
+        assert statistics.overlay_stds[label_index] == pytest.approx(values.std())
+        assert statistics.overlay_mins[label_index] == values.min()
+        assert statistics.overlay_maxs[label_index] == values.max()
+    assert numpy.isnan(statistics.overlay_means[1])
+    assert numpy.isnan(statistics.overlay_stds[1])
+    statistics = surface.label_statistics(
+        vertex_label_indices, overlay=numpy.stack((overlay, -overlay), axis=1)
+    )
+    assert statistics.overlay_means.shape == (3, 2)
+    assert statistics.overlay_maxs[0].tolist() == [81, 0]
+
+
+def test_label_statistics_annotation():
+    surface = _grid_surface(3)
+    with pytest.raises(RuntimeError, match=r"\bload_annotation_file\b"):
+        surface.label_statistics()
+    surface.annotation = Annotation()
+    for index in range(4):
+        surface.annotation.labels[index] = Label(
+            index=index, name=str(index), red=index, green=0, blue=0, transparency=0
+        )
+    surface.annotation.vertex_label_indices = numpy.array(
+        [1, 1, 0, 0, -1, 1], dtype=numpy.int32
+    )
+    statistics = surface.label_statistics()
+    assert statistics.vertex_counts.tolist() == [2, 3, 0, 0]
+    assert statistics.overlay_means is None
+    assert statistics.areas_mm2.tolist() == pytest.approx(
+        list(surface.label_areas_mm2().values())
+    )
+    with pytest.raises(ValueError, match=r"\b9 vertices, got array of shape \(8,\)"):
+        surface.label_statistics(numpy.zeros(8, dtype=int))
+    with pytest.raises(ValueError, match=r"\b9 vertices, got array of shape \(3, 3\)"):
+        surface.label_statistics(overlay=numpy.zeros((3, 3)))
+
+
+def test_label_statistics_many():
+    surfaces = [_grid_surface(3), _grid_surface(4), _grid_surface(2)]
+    vertex_label_indices = [
+        numpy.array([0, 0, 1] * 3),
+        numpy.array([3, -1] * 8),
+        numpy.array([-1] * 4),
+    ]
+    overlays = [numpy.arange(len(s.vertices), dtype=float) for s in surfaces]
+    results = Surface.label_statistics_many(
+        surfaces, vertex_label_indices, overlays=overlays
+    )
+    assert len(results) == 3
+    for surface, surface_vertex_label_indices, overlay, statistics in zip(
+        surfaces, vertex_label_indices, overlays, results
+    ):
+        expected = surface.label_statistics(
+            surface_vertex_label_indices, overlay=overlay
+        )
+        labels_num = len(expected.vertex_counts)
+        assert statistics.vertex_counts[:labels_num].tolist() == (
+            expected.vertex_counts.tolist()
+        )
+        assert not statistics.vertex_counts[labels_num:].any()
+        for name in ("areas_mm2", "centroids", "overlay_means", "overlay_stds"):
+            assert numpy.allclose(
+                getattr(statistics, name)[:labels_num],
+                getattr(expected, name),
+                equal_nan=True,
+            )
+    assert results[2].vertex_counts.tolist() == [0] * 4
+    assert not Surface.label_statistics_many([])
+
+
+def test_adjacency_edge_lengths_mm():
+    surface = _grid_surface(3)
+    adjacency = surface.adjacency_matrix()
+    lengths = surface.adjacency_edge_lengths_mm()
+    assert lengths.shape == adjacency.indices.shape
+    for vertex_index in range(9):
+        edges = slice(
+            adjacency.indptr[vertex_index], adjacency.indptr[vertex_index + 1]
+        )
+        assert lengths[edges] == pytest.approx(
+            surface.vertices[vertex_index].distance_mm(
+                surface.select_vertices(adjacency.indices[edges])
+            )
+        )
+    assert surface.adjacency_edge_lengths_mm() is lengths
+    surface.vertices[4] = Vertex(1.0, 1.0, 1.0)
+    assert surface.adjacency_edge_lengths_mm()[adjacency.indptr[4]] == pytest.approx(
+        numpy.sqrt(2)
+    )
+
+
+@pytest.mark.parametrize("fast_marching", [False, True])
+def test_geodesic_distances_mm(fast_marching):
+    surface = _grid_surface(4)
+    # planar wavefront from row 0
+    distances = surface.geodesic_distances_mm(range(4), fast_marching=fast_marching)
+    assert distances == pytest.approx(surface.vertex_coordinates[:, 0])
+    distances = surface.geodesic_distances_mm(
+        [0, 0], max_distance_mm=1.5, fast_marching=fast_marching
+    )
+    assert distances[[0, 1, 4]] == pytest.approx([0, 1, 1])
+    assert numpy.isinf(distances[[2, 3, 8, 15]]).all()
+    surface.add_vertex(Vertex(0.0, 0.0, 0.0))
+    distances = surface.geodesic_distances_mm([0], fast_marching=fast_marching)
+    assert numpy.isinf(distances[16])
+    assert numpy.isfinite(distances[:16]).all()
+    assert (
+        distances[:16]
+        >= numpy.linalg.norm(surface.vertex_coordinates[:16], axis=1) - 1e-9
+    ).all()
+    assert not numpy.isfinite(surface.geodesic_distances_mm([])).any()
+
+
+def test_geodesic_distances_mm_fast_marching():
+    surface = _grid_surface(6)
+    dijkstra_distances = surface.geodesic_distances_mm([0])
+    distances = surface.geodesic_distances_mm([0], fast_marching=True)
+    euclidean_distances = numpy.linalg.norm(surface.vertex_coordinates, axis=1)
+    # no diagonal edges towards vertex 35 at (5, 5)
+    assert dijkstra_distances[35] == pytest.approx(10)
+    assert distances[35] == pytest.approx(euclidean_distances[35], rel=0.1)
+    assert (distances <= dijkstra_distances + 1e-9).all()
+    assert (
+        numpy.abs(distances - euclidean_distances)
+        < numpy.abs(dijkstra_distances - euclidean_distances) + 1e-9
+    ).all()
+
+
+def test_geodesic_distances_mm_fast_marching_degenerate():
+    surface = Surface()
+    for i in range(3):
+        surface.add_vertex(Vertex(i, 0.0, 0.0))
+    surface.triangles.append(Triangle((0, 1, 2)))
+    assert numpy.isnan(surface._fast_marching_coefficients()).all()
+    distances = surface.geodesic_distances_mm([0], fast_marching=True)
+    assert distances.tolist() == [0.0, 1.0, 2.0]
+
+
+def test_geodesic_distances_mm_invalid():
+    surface = _grid_surface(2)
+    with pytest.raises(ValueError, match=r"\[0, 4\), got \[-1, 5\]$"):
+        surface.geodesic_distances_mm([2, 5, -1])
+    with pytest.raises(ValueError, match=r"\[0, 4\), got \[4\]$"):
+        surface.geodesic_distances_mm([4])
+
+
 def test_unite_2():
     surface_a = Surface()
     for i in range(0, 4):
@@ -751,6 +1795,125 @@ def test_unite_3():
     assert union.triangles[3:] == [Triangle((8, 9, 10)), Triangle((8, 9, 10))]
 
 
+def test_unite_empty():
+    with pytest.raises(ValueError):
+        Surface.unite([])
+
+
+def test_unite_metadata():
+    surface_a = Surface()
+    surface_a.creator = b"a"
+    surface_a.creation_datetime = datetime.datetime(2021, 5, 22, 7, 52, 53)
+    surface_a.using_old_real_ras = True
+    surface_a.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+    surface_a.command_lines = [b"?", b"!"]
+    surface_a.add_vertex(Vertex(0, 0, 0))
+    surface_b = Surface()
+    surface_b.creator = b"b"
+    union = Surface.unite([surface_a, surface_b])
+    assert union.creator == b"a"
+    assert union.creation_datetime == surface_a.creation_datetime
+    assert union.using_old_real_ras
+    assert union.volume_geometry_info == surface_a.volume_geometry_info
+    assert union.command_lines == [b"?", b"!"]
+    union.command_lines.append(b"unite")
+    assert surface_a.command_lines == [b"?", b"!"]
+    union.vertices[0] = Vertex(1, 1, 1)
+    assert surface_a.vertices[0] == pytest.approx(Vertex(0, 0, 0))
+
+
+def test_unite_weld_vertices():
+    surface_a = Surface()
+    for vertex in [(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)]:
+        surface_a.add_vertex(Vertex(*vertex))
+    surface_a.triangles.append(Triangle((0, 1, 2)))
+    surface_a.triangles.append(Triangle((1, 3, 2)))
+    surface_a.annotation = Annotation()
+    surface_a.annotation.vertex_label_indices = numpy.array([1, 2, 3])
+    surface_b = Surface()
+    for vertex in [(2, 0, 0), (1, -0.0, 0), (1, 1, 0), (2, 1, 0)]:
+        surface_b.add_vertex(Vertex(*vertex))
+    surface_b.triangles.append(Triangle((1, 0, 2)))
+    surface_b.triangles.append(Triangle((0, 3, 2)))
+    union = Surface.unite([surface_a, surface_b])
+    assert len(union.vertices) == 8
+    union = Surface.unite([surface_a, surface_b], weld_vertices=True)
+    assert numpy.allclose(
+        union.vertices,
+        [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0], [2, 0, 0], [2, 1, 0]],
+    )
+    assert union.triangles == [
+        Triangle((0, 1, 2)),
+        Triangle((1, 3, 2)),
+        Triangle((1, 4, 3)),
+        Triangle((4, 5, 3)),
+    ]
+    assert union.annotation.vertex_label_indices.tolist() == [1, 2, 3, -1, -1, -1]
+    assert surface_a.annotation.vertex_label_indices.tolist() == [1, 2, 3]
+    (border,) = union.find_borders()
+    assert border == PolygonalCircuit((0, 1, 4, 5, 3, 2))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 2**16])
+def test_unite_triangular_files(tmpdir, chunk_size):
+    surface_a_path = tmpdir.join("a").strpath
+    surface_a = write_example_surface(surface_a_path)
+    surface_b = Surface()
+    surface_b.creator = b"b"
+    surface_b.volume_geometry_info = tuple(b"!\n" for _ in range(8))
+    for i in range(5):
+        surface_b.add_vertex(Vertex(i, -i, i / 3))
+    surface_b.triangles = [
+        Triangle((0, 1, 4)),
+        Triangle((1, 3, 4)),
+        Triangle((2, 3, 4)),
+    ]
+    surface_b_path = tmpdir.join("b").strpath
+    surface_b.write_triangular(surface_b_path)
+    surface_c_path = tmpdir.join("c").strpath
+    Surface.unite([surface_b, Surface()]).write_triangular(surface_c_path)
+    input_paths = [surface_a_path, surface_b_path, surface_c_path, surface_a_path]
+    output_path = tmpdir.join("union").strpath
+    Surface.unite_triangular_files(
+        input_paths,
+        output_path,
+        creation_datetime=surface_a.creation_datetime,
+        chunk_size=chunk_size,
+    )
+    expected_path = tmpdir.join("expected").strpath
+    Surface.unite(map(Surface.read_triangular, input_paths)).write_triangular(
+        expected_path, creation_datetime=surface_a.creation_datetime
+    )
+    with open(output_path, "rb") as output_file, open(
+        expected_path, "rb"
+    ) as expected_file:
+        assert output_file.read() == expected_file.read()
+    union = Surface.read_triangular(output_path)
+    assert len(union.vertices) == 4 + 5 + 5 + 4
+    assert union.triangles[-1] == Triangle((14, 15, 17))
+    assert union.creator == b"pytest"
+    assert union.command_lines == [b"?", b"!"]
+
+
+def test_unite_triangular_files_empty(tmpdir):
+    with pytest.raises(ValueError):
+        Surface.unite_triangular_files([], tmpdir.join("union").strpath)
+
+
+def test_unite_triangular_files_truncated(tmpdir):
+    surface_path = tmpdir.join("surface").strpath
+    write_example_surface(surface_path)
+    _, vertices_num, triangles_num, offset = Surface._scan_triangular(surface_path)
+    with open(surface_path, "r+b") as surface_file:
+        surface_file.truncate(offset + 4 * 3 * (vertices_num + 1))
+    chunks = Surface._read_block_chunks(
+        surface_path, offset + 4 * 3 * vertices_num, triangles_num, chunk_size=1
+    )
+    assert len(next(chunks)) == 4 * 3
+    with pytest.raises(AssertionError):
+        next(chunks)
+
+
 def test_unite_real():
     surface_a = Surface.read_triangular(SURFACE_FILE_PATH)
     surface_b = Surface()
@@ -772,3 +1935,93 @@ def test_unite_real():
     assert union.volume_geometry_info == surface_a.volume_geometry_info
     assert union.command_lines == surface_a.command_lines
     assert union.annotation == surface_a.annotation
+
+
+def test_vertices_array_backed():
+    surface = Surface()
+    assert surface.vertex_coordinates.shape == (0, 3)
+    surface.vertices = [Vertex(0.0, 1.0, 2.0), Vertex(3.0, 4.0, 5.0)]
+    assert surface.add_vertex(Vertex(6.0, 7.0, 8.0)) == 2
+    assert isinstance(surface.vertices[2], Vertex)
+    assert surface.vertices[2].superior == pytest.approx(8.0)
+    assert numpy.allclose(surface.vertex_coordinates, numpy.arange(9).reshape(3, 3))
+    surface.vertex_coordinates[1, 0] = -3.0
+    assert surface.vertices[1].right == pytest.approx(-3.0)
+    vertex = surface.vertices[0]
+    surface.vertices[0] = Vertex(-1.0, -1.0, -1.0)
+    assert surface.vertex_coordinates[0] == pytest.approx([-1.0, -1.0, -1.0])
+    assert vertex.tolist() == [0.0, 1.0, 2.0]
+    geometry_version = surface.geometry_version
+    with pytest.raises(ValueError, match=r"read-only"):
+        surface.vertices[0][0] = 42.0
+    assert surface.vertex_coordinates[0, 0] == pytest.approx(-1.0)
+    assert surface.geometry_version == geometry_version
+    assert surface.vertices.pop().anterior == pytest.approx(7.0)
+    assert surface.vertex_coordinates.shape == (2, 3)
+    surface.vertices.insert(-2, Vertex(9.0, 9.0, 9.0))
+    del surface.vertices[1]
+    assert numpy.allclose(surface.vertices, [[9, 9, 9], [-3, 4, 5]])
+    assert surface.vertices == [Vertex(9.0, 9.0, 9.0), Vertex(-3.0, 4.0, 5.0)]
+    assert surface.vertices != [Vertex(9.0, 9.0, 9.0)]
+    assert surface.vertices != "dummy"
+
+
+def test_vertices_read_only():
+    surface = Surface()
+    surface.vertices = [Vertex(0.0, 1.0, 2.0), Vertex(3.0, 4.0, 5.0)]
+    vertex = next(iter(surface.vertices))
+    with pytest.raises(ValueError, match=r"read-only"):
+        vertex *= 2
+    vertex = surface.vertices[1:][0]
+    with pytest.raises(ValueError, match=r"read-only"):
+        vertex += 1
+    assert surface.vertex_coordinates.tolist() == [[0, 1, 2], [3, 4, 5]]
+    surface.vertices[1] = surface.vertices[0] * 2
+    assert surface.vertices[1].tolist() == [0, 2, 4]
+    assert surface.vertices[1].flags.writeable is False
+
+
+def test_triangles_array_backed():
+    surface = Surface()
+    surface.triangles = [Triangle((0, 1, 2)), Triangle((1, 2, 3))]
+    assert surface.triangle_vertex_indices.dtype == numpy.uint32
+    assert surface.triangle_vertex_indices.tolist() == [[0, 1, 2], [1, 2, 3]]
+    surface.triangles.append(Triangle((2, 3, 4)))
+    assert surface.triangles[-1] == Triangle((2, 3, 4))
+    assert isinstance(surface.triangles[-1].vertex_indices[0], int)
+    assert surface.triangles[:2] == [Triangle((0, 1, 2)), Triangle((1, 2, 3))]
+    assert [Triangle((2, 0, 1))] == surface.triangles[:1]
+    surface.triangles[1:2] = [Triangle((5, 6, 7)), Triangle((6, 7, 8))]
+    assert surface.triangle_vertex_indices.tolist() == [
+        [0, 1, 2],
+        [5, 6, 7],
+        [6, 7, 8],
+        [2, 3, 4],
+    ]
+    surface.triangles[::2] = [Triangle((1, 1, 1)), Triangle((3, 3, 3))]
+    assert surface.triangle_vertex_indices[:, 0].tolist() == [1, 5, 3, 2]
+    surface.triangles.remove(Triangle((7, 5, 6)))
+    del surface.triangles[:2]
+    assert surface.triangles == [Triangle((2, 3, 4))]
+    assert surface.triangles != "dummy"
+    assert repr(surface.triangles) == "[Triangle(vertex_indices=(2, 3, 4))]"
+
+
+def test_vertex_coordinates_copy_on_write():
+    coordinates = numpy.arange(6, dtype=">f4").reshape((2, 3))
+    coordinates.flags.writeable = False
+    surface = Surface()
+    surface.vertex_coordinates = coordinates
+    assert numpy.shares_memory(surface.vertex_coordinates, coordinates)
+    surface.vertices[0] = Vertex(-1.0, -2.0, -3.0)
+    assert coordinates.tolist() == [[0, 1, 2], [3, 4, 5]]
+    assert surface.vertex_coordinates.tolist() == [[-1, -2, -3], [3, 4, 5]]
+    assert surface.vertex_coordinates.dtype == numpy.float64
+
+
+def test_triangle_vertex_indices_invalid_shape():
+    surface = Surface()
+    with pytest.raises(ValueError, match=r"\(N, 3\)"):
+        surface.triangle_vertex_indices = numpy.zeros((2, 4), dtype=numpy.uint32)
+    surface.triangle_vertex_indices = numpy.zeros(0, dtype=numpy.uint32)
+    assert not surface.triangles
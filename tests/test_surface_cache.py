@@ -0,0 +1,211 @@
+# freesurfer-surface - Read and Write Surface Files in Freesurfer’s TriangularSurface Format
+#
+# Copyright (C) 2020 Fabian Peter Hammerle <fabian@hammerle.me>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+import numpy
+import pytest
+
+from conftest import write_example_surface
+from freesurfer_surface import Surface, Triangle, Vertex
+from freesurfer_surface.cache import SurfaceCache
+
+
+def _entry_names(cache_dir) -> list:
+    return sorted(name for name in os.listdir(cache_dir) if not name.startswith("."))
+
+
+def _assert_surfaces_equal(surface: Surface, expected: Surface) -> None:
+    assert numpy.array_equal(surface.vertex_coordinates, expected.vertex_coordinates)
+    assert surface.vertex_coordinates.dtype == expected.vertex_coordinates.dtype
+    assert numpy.array_equal(
+        surface.triangle_vertex_indices, expected.triangle_vertex_indices
+    )
+    assert surface.triangle_vertex_indices.dtype == numpy.uint32
+    assert surface.creator == expected.creator
+    assert surface.creation_datetime == expected.creation_datetime
+    assert surface.volume_geometry_info == expected.volume_geometry_info
+    assert surface.command_lines == expected.command_lines
+
+
+def test_open_triangular(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    write_example_surface(surface_path)
+    expected = Surface.read_triangular(surface_path)
+    cache_dir = tmpdir.join("cache").strpath
+    cache = SurfaceCache(cache_dir)
+    surface = cache.open_triangular(surface_path)
+    _assert_surfaces_equal(surface, expected)
+    assert not isinstance(surface.vertex_coordinates, numpy.memmap)
+    assert len(_entry_names(cache_dir)) == 1
+    surface = SurfaceCache(cache_dir).open_triangular(surface_path)
+    _assert_surfaces_equal(surface, expected)
+    assert isinstance(surface.vertex_coordinates, numpy.memmap)
+    assert isinstance(surface.triangle_vertex_indices, numpy.memmap)
+    assert surface.vertex_coordinates.dtype.isnative
+    assert len(_entry_names(cache_dir)) == 1
+
+
+def test_open_triangular_copy_on_write(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    expected = write_example_surface(surface_path)
+    cache = SurfaceCache(tmpdir.join("cache").strpath)
+    cache.open_triangular(surface_path)
+    surface = cache.open_triangular(surface_path)
+    surface.vertices[0] = Vertex(-1.0, -1.0, -1.0)
+    surface.triangles.append(Triangle((1, 2, 3)))
+    _assert_surfaces_equal(cache.open_triangular(surface_path), expected)
+
+
+def test_open_triangular_modified(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    original = write_example_surface(surface_path)
+    cache_dir = tmpdir.join("cache").strpath
+    cache = SurfaceCache(cache_dir)
+    cache.open_triangular(surface_path)
+    file_stat = os.stat(surface_path)
+    # same size & modification time, one vertex moved
+    vertices = list(original.vertices)
+    vertices[0] = Vertex(9.0, 9.0, 9.0)
+    expected = write_example_surface(surface_path, vertices=vertices)
+    os.utime(surface_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    assert os.stat(surface_path).st_size == file_stat.st_size
+    assert os.stat(surface_path).st_mtime_ns == file_stat.st_mtime_ns
+    _assert_surfaces_equal(cache.open_triangular(surface_path), expected)
+    _assert_surfaces_equal(cache.open_triangular(surface_path), expected)
+    assert len(_entry_names(cache_dir)) == 2
+
+
+def _truncate(file_path: str) -> None:
+    with open(file_path, "r+b") as file:
+        file.truncate(64)
+
+
+@pytest.mark.parametrize("corrupt_entry", [os.remove, _truncate])
+def test_open_triangular_corrupt_entry(tmpdir, corrupt_entry):
+    surface_path = tmpdir.join("lh.pial").strpath
+    expected = write_example_surface(surface_path)
+    cache_dir = tmpdir.join("cache").strpath
+    cache = SurfaceCache(cache_dir)
+    cache.open_triangular(surface_path)
+    (entry_name,) = _entry_names(cache_dir)
+    # pylint: disable=protected-access
+    corrupt_entry(os.path.join(cache_dir, entry_name, cache._TRIANGLES_FILE_NAME))
+    _assert_surfaces_equal(cache.open_triangular(surface_path), expected)
+    assert _entry_names(cache_dir) == [entry_name]
+    surface = cache.open_triangular(surface_path)
+    _assert_surfaces_equal(surface, expected)
+    assert isinstance(surface.triangle_vertex_indices, numpy.memmap)
+
+
+def test_store_entry_concurrently_added(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    expected = write_example_surface(surface_path)
+    cache_dir = tmpdir.join("cache").strpath
+    cache = SurfaceCache(cache_dir)
+    cache.open_triangular(surface_path)
+    (entry_name,) = _entry_names(cache_dir)
+    # pylint: disable=protected-access
+    cache._store_entry(
+        os.path.join(cache_dir, entry_name),
+        numpy.zeros((1, 3)),
+        numpy.zeros((0, 3), dtype=numpy.uint32),
+    )
+    assert os.listdir(cache_dir) == [entry_name]
+    _assert_surfaces_equal(cache.open_triangular(surface_path), expected)
+
+
+def test_entry_size_removed(tmpdir):
+    # pylint: disable=protected-access
+    assert SurfaceCache._entry_size(tmpdir.join("missing").strpath) == 0
+
+
+def test_evict_ignores_foreign_files(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    cache = SurfaceCache(cache_dir, max_bytes=1)
+    os.mkdir(os.path.join(cache_dir, ".incomplete"))
+    with open(os.path.join(cache_dir, "foreign"), "wb") as foreign_file:
+        foreign_file.write(b"foreign")
+    surface_paths = [tmpdir.join(f"{i}.pial").strpath for i in range(2)]
+    for surface_path in surface_paths:
+        write_example_surface(surface_path)
+        cache.open_triangular(surface_path)
+    assert len(_entry_names(cache_dir)) == 2  # entry & foreign file
+    assert os.path.isdir(os.path.join(cache_dir, ".incomplete"))
+    assert os.path.isfile(os.path.join(cache_dir, "foreign"))
+
+
+def test_open_triangular_empty(tmpdir):
+    surface_path = tmpdir.join("empty").strpath
+    expected = Surface()
+    expected.creator = b"pytest"
+    expected.volume_geometry_info = tuple(b"?\n" for _ in range(8))
+    expected.write_triangular(surface_path)
+    cache = SurfaceCache(tmpdir.join("cache").strpath)
+    for _ in range(2):
+        surface = cache.open_triangular(surface_path)
+        assert surface.vertex_coordinates.shape == (0, 3)
+        assert not surface.triangles
+
+
+def test_open_triangular_evict(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    cache = SurfaceCache(cache_dir)
+    surface_paths = [tmpdir.join(f"{i}.pial").strpath for i in range(3)]
+    entry_names = []
+    for surface_index, surface_path in enumerate(surface_paths):
+        # entries are keyed by content
+        write_example_surface(
+            surface_path, vertices=[Vertex(surface_index, i, 0) for i in range(4)]
+        )
+        cache.open_triangular(surface_path)
+        (entry_name,) = set(_entry_names(cache_dir)).difference(entry_names)
+        entry_names.append(entry_name)
+    entry_size = sum(
+        os.path.getsize(os.path.join(cache_dir, entry_names[0], name))
+        for name in os.listdir(os.path.join(cache_dir, entry_names[0]))
+    )
+    cache.clear()
+    cache.max_bytes = entry_size * 2
+    for entry_index, surface_path in enumerate(surface_paths[:2]):
+        cache.open_triangular(surface_path)
+        entry_path = os.path.join(cache_dir, entry_names[entry_index])
+        os.utime(entry_path, ns=(entry_index, entry_index))
+    cache.open_triangular(surface_paths[0])  # hit marks entry as recently used
+    cache.open_triangular(surface_paths[2])
+    assert _entry_names(cache_dir) == sorted([entry_names[0], entry_names[2]])
+    cache.max_bytes = 1
+    cache.open_triangular(surface_paths[1])
+    assert _entry_names(cache_dir) == [entry_names[1]]
+    _assert_surfaces_equal(
+        cache.open_triangular(surface_paths[1]),
+        Surface.read_triangular(surface_paths[1]),
+    )
+
+
+def test_clear(tmpdir):
+    surface_path = tmpdir.join("lh.pial").strpath
+    write_example_surface(surface_path)
+    cache_dir = tmpdir.join("cache").strpath
+    cache = SurfaceCache(cache_dir)
+    cache.open_triangular(surface_path)
+    assert _entry_names(cache_dir)
+    cache.clear()
+    assert not _entry_names(cache_dir)
+    assert isinstance(
+        cache.open_triangular(surface_path).vertex_coordinates, numpy.ndarray
+    )